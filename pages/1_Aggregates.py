@@ -0,0 +1,65 @@
+import streamlit as st
+
+from sss.quiz_bank import QUIZ_QUESTIONS
+from sss.results_store import DEFAULT_PATH as RESULTS_DB, read_aggregates
+from sss.scoring import SKIP
+from sss.theme import APP_CSS
+
+# Aggregates come from the incrementally maintained summary tables; cache
+# them briefly so a busy page doesn't even hit those
+REFRESH_SECONDS = 30
+
+st.set_page_config(
+    page_title="Food Classifier - Aggregates",
+    page_icon="📊",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+st.markdown(APP_CSS, unsafe_allow_html=True)
+
+
+@st.cache_data(ttl=REFRESH_SECONDS, show_spinner=False)
+def load_aggregates(path):
+    return read_aggregates(path)
+
+
+st.markdown("""
+    <div class="title-container">
+        <h1>📊 CLASSIFICATION AGGREGATES</h1>
+        <p>Every finished classification, summed up</p>
+    </div>
+""", unsafe_allow_html=True)
+
+if not RESULTS_DB:
+    st.info("Saving results is turned off (SSS_RESULTS_DB is empty).")
+    st.stop()
+
+agg = load_aggregates(RESULTS_DB)
+total = agg["total"]
+st.caption(f"{total:,} classifications · refreshed every {REFRESH_SECONDS} s")
+if not total:
+    st.info("No classifications saved yet.")
+    st.stop()
+
+# Winner distribution and average percentages
+cols = st.columns(len(agg["winners"]))
+for col, (label, n), (cat, avg) in zip(cols, agg["winners"].items(), agg["avg_pcts"].items()):
+    with col:
+        st.metric(label, f"{n / total:.1%}", help=f"{n:,} wins")
+        st.caption(f"average {cat} share: {avg:.1f}%")
+
+st.markdown("### Winner distribution")
+st.bar_chart({"Classifications": agg["winners"]})
+
+# Per-question option frequencies
+st.markdown("### Answers per question")
+for q_idx, (question, counts) in enumerate(zip(QUIZ_QUESTIONS, agg["options"])):
+    asked = sum(counts)
+    labels = [opt["text"] for opt in question["options"]] + ["Skipped"]
+    counts = counts[:len(question["options"])] + counts[SKIP:]
+    with st.expander(f"Q{q_idx + 1}. {question['question']}  ({asked:,} answers)"):
+        st.dataframe(
+            [{"Answer": label, "Count": n, "Share": f"{n / asked:.1%}" if asked else "-"}
+             for label, n in zip(labels, counts)],
+            use_container_width=True, hide_index=True,
+        )
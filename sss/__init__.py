@@ -0,0 +1 @@
+"""Headless engine behind the soup / salad / sandwich food classifier."""
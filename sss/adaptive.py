@@ -0,0 +1,252 @@
+"""Adaptive question ordering by expected information gain.
+
+Instead of asking questions in ``QUIZ_QUESTIONS`` order, the scheduler asks
+whichever open question is expected to tell us the most about the final
+winner, given the answers so far:
+
+    gain(q) = H(winner | answers) - sum_o P(q = o | answers) H(winner | answers, q = o)
+
+Answer probabilities come from per-question option priors (uniform over the
+options and skip by default, or fitted from past answer data and keyed by the
+question and option texts), treated as independent across questions.  Winners for every complete answer vector come
+from the precomputed outcome table, so conditioning on answers is a slice of a
+(5,) * 10 tensor.
+
+Decisions are memoized per set of answers.  The first ``PRECOMPUTE_DEPTH``
+levels of the decision tree (every node up to five answers deep, where a
+fresh decision can take milliseconds) are precomputed once and saved to
+``SSS_DECISION_TREE`` (default ``decision_tree.json`` next to the outcome
+table), keyed by the ``weights_digest`` and the priors, so picking the next
+question at quiz time is a dict lookup; deeper nodes are decided on first use
+in about half a millisecond.
+
+Usage::
+
+    python -m sss.adaptive fit-priors answers.jsonl -o priors.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from sss.answer_files import detect_format, open_input, read_chunks
+from sss.outcome_table import DEFAULT_PATH as TABLE_PATH, load_table
+from sss.quiz_bank import QUIZ_QUESTIONS
+from sss.scoring import LABELS, N_QUESTIONS, SKIP, weights_digest
+
+PRIORS_PATH = os.environ.get("SSS_PRIORS")
+TREE_PATH = Path(os.environ.get("SSS_DECISION_TREE", TABLE_PATH.with_name("decision_tree.json")))
+N_CHOICES = SKIP + 1
+
+# Tree levels decided up front (and saved); a fresh decision below them takes about 0.5 ms
+PRECOMPUTE_DEPTH = 6
+
+
+def uniform_priors():
+    return np.full((N_QUESTIONS, N_CHOICES), 1.0 / N_CHOICES)
+
+
+def fit_priors(chunks, smoothing=1.0):
+    """Option frequencies per question (skip included) from ``(fields, answers)`` chunks."""
+    counts = np.full((N_QUESTIONS, N_CHOICES), smoothing)
+    for _fields, answers in chunks:
+        for q_idx in range(N_QUESTIONS):
+            counts[q_idx] += np.bincount(answers[:, q_idx], minlength=N_CHOICES)
+    return counts / counts.sum(axis=1, keepdims=True)
+
+
+def quiz_digest():
+    """SHA-256 of the question and option texts, in order: what answer frequencies depend on.
+
+    Re-weighting the options does not change how people answer, so priors
+    stay valid across weight changes; rewording or reordering does not.
+    """
+    texts = [[q["question"], *(o["text"] for o in q["options"])] for q in QUIZ_QUESTIONS]
+    return hashlib.sha256(json.dumps(texts).encode("utf-8")).hexdigest()
+
+
+def save_priors(priors, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"quiz_digest": quiz_digest(), "priors": np.asarray(priors).tolist()}, f, indent=1)
+
+
+def load_priors(path=PRIORS_PATH):
+    """Priors from ``path``, or uniform ones (with a warning) if the file is missing or fits another quiz."""
+    if not path or not os.path.exists(path):
+        return uniform_priors()
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    priors = np.asarray(data["priors"], dtype=np.float64)
+    if priors.shape != (N_QUESTIONS, N_CHOICES) or data.get("quiz_digest") != quiz_digest():
+        print(f"{path}: priors were fitted for different questions or options; using uniform priors",
+              file=sys.stderr)
+        return uniform_priors()
+    return priors / priors.sum(axis=1, keepdims=True)
+
+
+def _entropy(p):
+    p = p[p > 0]
+    return float(-(p * np.log2(p)).sum())
+
+
+class AdaptiveScheduler:
+    """Greedy information-gain question picker with a memoized decision tree."""
+
+    def __init__(self, priors=None, table=None, precompute_depth=PRECOMPUTE_DEPTH, cache_size=200000,
+                 tree_path=TREE_PATH):
+        self.priors = uniform_priors() if priors is None else np.asarray(priors, dtype=np.float64)
+        table = load_table() if table is None else table
+        # Outcome table records are indexed with question 0 as the least
+        # significant digit; transpose so that axis q is question q
+        self._winners = table.records["winner"].reshape((N_CHOICES,) * N_QUESTIONS).transpose()
+        # Decision LRU shared by every session thread, like charts.RenderCache
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        if not (tree_path and self.load_tree(tree_path, precompute_depth)):
+            self.precompute(precompute_depth)
+            if tree_path:
+                self.save_tree(tree_path, precompute_depth)
+
+    def tree_key(self):
+        """What a saved decision tree must have been built for: the weights and these priors."""
+        return {
+            "weights_digest": weights_digest(),
+            "priors_digest": hashlib.sha256(np.ascontiguousarray(self.priors, dtype="<f8").tobytes()).hexdigest(),
+        }
+
+    def winner_distribution(self, answers):
+        """P(winner | answers) as an array over ``LABELS``."""
+        return self._joint(answers)[1]
+
+    def next_question(self, answers):
+        """Index of the open question with the highest expected information gain.
+
+        ``answers`` maps question index -> option index (``SKIP`` for a skip).
+        Returns None once every question has been answered.
+        """
+        key = tuple(sorted(answers.items()))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        # Decide outside the lock; a concurrent miss on the same answers just decides twice
+        q_idx = self._best_question(answers)
+        with self._lock:
+            self._cache[key] = q_idx
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return q_idx
+
+    def precompute(self, depth):
+        """Fill the decision cache for the first ``depth`` questions of every path."""
+        frontier = [{}]
+        for _ in range(depth):
+            next_frontier = []
+            for answers in frontier:
+                q_idx = self.next_question(answers)
+                if q_idx is None:
+                    continue
+                next_frontier.extend({**answers, q_idx: o_idx} for o_idx in range(N_CHOICES))
+            frontier = next_frontier
+
+    def save_tree(self, path, depth):
+        """Write the cached decisions atomically to ``path``."""
+        path = Path(path)
+        with self._lock:
+            decisions = [[list(map(list, key)), q_idx] for key, q_idx in self._cache.items() if len(key) < depth]
+        tmp = path.with_name(path.name + f".tmp{os.getpid()}")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({**self.tree_key(), "depth": depth, "decisions": decisions}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            # A read-only checkout still works, it just decides the first levels again next time
+            print(f"could not save the decision tree to {path}: {e}", file=sys.stderr)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def load_tree(self, path, depth):
+        """Fill the cache from a saved tree; False if there is none for these weights, priors and depth."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if any(data.get(k) != v for k, v in self.tree_key().items()) or data.get("depth", 0) < depth:
+            return False
+        for key, q_idx in data["decisions"]:
+            self._cache[tuple(map(tuple, key))] = q_idx
+        return True
+
+    def _joint(self, answers):
+        """Per open question, the joint P(option, winner); plus P(winner)."""
+        open_qs = [q for q in range(N_QUESTIONS) if q not in answers]
+        sub = self._winners[tuple(answers.get(q, slice(None)) for q in range(N_QUESTIONS))]
+        weights = np.ones((), dtype=np.float32)
+        for q_idx in open_qs:
+            weights = np.multiply.outer(weights, self.priors[q_idx].astype(np.float32))
+
+        joints = {q_idx: np.zeros((N_CHOICES, len(LABELS))) for q_idx in open_qs}
+        marginal = np.zeros(len(LABELS))
+        for c_idx in range(len(LABELS)):
+            mass = np.where(sub == c_idx, weights, 0)
+            marginal[c_idx] = mass.sum()
+            for axis, q_idx in enumerate(open_qs):
+                others = tuple(a for a in range(len(open_qs)) if a != axis)
+                joints[q_idx][:, c_idx] = mass.sum(axis=others)
+        total = marginal.sum()
+        return {q: j / total for q, j in joints.items()}, marginal / total
+
+    def _best_question(self, answers):
+        joints, marginal = self._joint(answers)
+        if not joints:
+            return None
+        base = _entropy(marginal)
+        best, best_gain = None, -1.0
+        # Open questions in list order, so ties (e.g. an already decided
+        # winner) keep the original ordering
+        for q_idx in sorted(joints):
+            joint = joints[q_idx]
+            p_option = joint.sum(axis=1)
+            conditional = sum(p * _entropy(row / p) for p, row in zip(p_option, joint) if p > 0)
+            gain = base - conditional
+            if gain > best_gain + 1e-12:
+                best, best_gain = q_idx, gain
+        return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sss.adaptive",
+                                     description="Fit option priors for adaptive question ordering.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    fit = sub.add_parser("fit-priors", help="count option frequencies in past answer data")
+    fit.add_argument("input", help="JSONL or CSV answer file ('-' for stdin)")
+    fit.add_argument("-o", "--output", required=True, help="priors JSON to write")
+    fit.add_argument("--input-format", choices=["jsonl", "csv"])
+    fit.add_argument("--smoothing", type=float, default=1.0, help="pseudo-count added to every option")
+    args = parser.parse_args(argv)
+
+    stream = open_input(args.input)
+    try:
+        chunks = read_chunks(stream, args.input_format or detect_format(args.input), errors="skip")
+        priors = fit_priors(chunks, smoothing=args.smoothing)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    save_priors(priors, args.output)
+    print(f"wrote priors to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
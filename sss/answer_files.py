@@ -0,0 +1,190 @@
+"""Streaming readers for answer-set files (JSONL or CSV).
+
+Each record carries one answer per question in ``QUIZ_QUESTIONS`` order.  An
+answer is either a 0-based option index or the option text (matched case
+insensitively); ``null``, an empty cell or ``"skip"`` marks a skipped question.
+
+JSONL lines are either a bare list of answers or an object with an
+``"answers"`` list; CSV files need ``q1`` .. ``q10`` columns.  Any other fields
+(ids, labels, ...) are passed through untouched.
+
+Files are read in fixed-size chunks so memory stays flat regardless of the
+input size.  ``read_blocks`` splits a file into blocks of raw lines without
+decoding them, so the parsing can happen in ``parse_block`` in another process.
+"""
+
+import csv
+import itertools
+import json
+import sys
+
+import numpy as np
+
+from sss.quiz_bank import QUIZ_QUESTIONS
+from sss.scoring import N_QUESTIONS, SKIP
+
+ANSWER_COLUMNS = [f"q{i + 1}" for i in range(N_QUESTIONS)]
+SKIP_VALUES = {"", "skip", "skipped", "<skipped>"}
+
+# Per question: lowercased option text -> option index
+_OPTION_LOOKUP = [
+    {opt["text"].strip().lower(): o_idx for o_idx, opt in enumerate(q["options"])}
+    for q in QUIZ_QUESTIONS
+]
+
+
+def parse_option(q_idx, value):
+    """Turn one raw answer (index, text or skip marker) into an option index."""
+    if value is None:
+        return SKIP
+    if isinstance(value, bool):
+        raise ValueError(f"q{q_idx + 1}: unexpected boolean answer")
+    if isinstance(value, int):
+        o_idx = value
+    else:
+        text = str(value).strip().lower()
+        if text in SKIP_VALUES:
+            return SKIP
+        if text in _OPTION_LOOKUP[q_idx]:
+            return _OPTION_LOOKUP[q_idx][text]
+        if not text.lstrip("-").isdigit():
+            raise ValueError(f"q{q_idx + 1}: unknown option {value!r}")
+        o_idx = int(text)
+    if not 0 <= o_idx < len(_OPTION_LOOKUP[q_idx]):
+        raise ValueError(f"q{q_idx + 1}: option index {o_idx} out of range")
+    return o_idx
+
+
+def parse_answers(values):
+    """Parse a full list of raw answers into a list of option indices."""
+    if len(values) != N_QUESTIONS:
+        raise ValueError(f"expected {N_QUESTIONS} answers, got {len(values)}")
+    return [parse_option(q_idx, v) for q_idx, v in enumerate(values)]
+
+
+def detect_format(path):
+    return "csv" if str(path).lower().endswith(".csv") else "jsonl"
+
+
+def _jsonl_records(stream, first_line=1):
+    for line_no, line in enumerate(stream, first_line):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, {}, ValueError(f"invalid JSON: {e.msg}")
+            continue
+        if isinstance(obj, list):
+            yield line_no, {}, obj
+        elif isinstance(obj, dict) and isinstance(obj.get("answers"), list):
+            fields = {k: v for k, v in obj.items() if k != "answers"}
+            yield line_no, fields, obj["answers"]
+        else:
+            yield line_no, {}, ValueError('expected a list or an object with an "answers" list')
+
+
+def _check_columns(fieldnames):
+    missing = [c for c in ANSWER_COLUMNS if c not in (fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV input is missing answer columns: {', '.join(missing)}")
+
+
+def _csv_records(stream, fieldnames=None, first_line=1):
+    # Without fieldnames the first line is the header; with them, stream starts at line first_line
+    reader = csv.DictReader(stream, fieldnames=fieldnames)
+    _check_columns(reader.fieldnames)
+    for row in reader:
+        fields = {k: v for k, v in row.items() if k not in ANSWER_COLUMNS}
+        yield first_line - 1 + reader.line_num, fields, [row[c] for c in ANSWER_COLUMNS]
+
+
+def iter_records(stream, fmt, fieldnames=None, first_line=1):
+    """Yield ``(line_no, passthrough_fields, raw_answers_or_error)`` per record."""
+    if fmt == "csv":
+        return _csv_records(stream, fieldnames, first_line)
+    if fmt == "jsonl":
+        return _jsonl_records(stream, first_line)
+    raise ValueError(f"unknown input format: {fmt}")
+
+
+def _parse_batch(batch, errors, on_error):
+    fields, rows = [], []
+    for line_no, extra, raw in batch:
+        try:
+            if isinstance(raw, Exception):
+                raise raw
+            rows.append(parse_answers(raw))
+        except ValueError as e:
+            if errors == "raise":
+                raise ValueError(f"line {line_no}: {e}") from None
+            if on_error is not None:
+                on_error(line_no, e)
+            continue
+        fields.append(extra)
+    return fields, np.array(rows, dtype=np.int8).reshape(len(rows), N_QUESTIONS)
+
+
+def read_chunks(stream, fmt, chunk_size=10000, errors="raise", on_error=None):
+    """Yield ``(fields, answers)`` chunks.
+
+    ``fields`` is a list of passthrough dicts and ``answers`` an int8 array of
+    shape (len(fields), N_QUESTIONS).  Invalid records raise ``ValueError``
+    (``errors="raise"``) or are dropped (``errors="skip"``), in which case
+    ``on_error(line_no, exc)`` is called for each of them.
+    """
+    records = iter_records(stream, fmt)
+    while True:
+        batch = list(itertools.islice(records, chunk_size))
+        if not batch:
+            return
+        fields, answers = _parse_batch(batch, errors, on_error)
+        if fields:
+            yield fields, answers
+
+
+def read_blocks(stream, fmt, block_size=10000):
+    """Yield ``(fieldnames, first_line, lines)`` blocks of raw, undecoded records.
+
+    Blocks hold about ``block_size`` lines and never split a record (a quoted
+    CSV cell may span lines).  ``fieldnames`` is the CSV header (None for
+    JSONL) and ``first_line`` the line number of ``lines[0]``; pass all three
+    to ``parse_block``.
+    """
+    fieldnames, first_line = None, 1
+    if fmt == "csv":
+        fieldnames = next(csv.reader([stream.readline()]), [])
+        _check_columns(fieldnames)
+        first_line = 2
+    elif fmt != "jsonl":
+        raise ValueError(f"unknown input format: {fmt}")
+    lines, in_quotes = [], False
+    for line in stream:
+        lines.append(line)
+        if fmt == "csv" and line.count('"') % 2:
+            in_quotes = not in_quotes
+        if len(lines) >= block_size and not in_quotes:
+            yield fieldnames, first_line, lines
+            first_line += len(lines)
+            lines = []
+    if lines:
+        yield fieldnames, first_line, lines
+
+
+def parse_block(fmt, fieldnames, first_line, lines, errors="raise"):
+    """Parse one ``read_blocks`` block into ``(fields, answers, skipped)``.
+
+    ``fields`` and ``answers`` are as in ``read_chunks``; ``skipped`` lists
+    ``(line_no, exc)`` for the invalid records dropped with ``errors="skip"``.
+    """
+    skipped = []
+    batch = list(iter_records(lines, fmt, fieldnames, first_line))
+    fields, answers = _parse_batch(batch, errors, lambda line_no, e: skipped.append((line_no, e)))
+    return fields, answers, skipped
+
+
+def open_input(path):
+    if path == "-":
+        return sys.stdin
+    return open(path, newline="", encoding="utf-8")
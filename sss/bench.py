@@ -0,0 +1,278 @@
+"""Offline benchmark suite for the classifier.
+
+Measures, in this process and without any network access:
+
+* scoring: ``normalize_pcts`` on running totals, batched ``score`` and a
+  complete ``QuizRecord``;
+* explanation: a ``QuizRecord`` tallying reasons as answers are recorded,
+  its ``explain`` on the results screen and the bulk ``answer_bullets`` path
+  (``python -m sss.explain_reference`` checks both against the original
+  helpers);
+* rendering: ``create_pie_chart`` build and JSON serialization (what
+  ``st.plotly_chart`` sends) and ``create_pie_svg``;
+* full script reruns of every screen (start, mid-quiz, completed) through
+  Streamlit's headless ``AppTest``, with the peak memory allocated per rerun.
+
+Each benchmark is repeated and reported as the median time per operation.
+Reports can be saved and compared against a baseline.
+
+Usage::
+
+    python -m sss.bench --json bench.json
+    python -m sss.bench --baseline bench.json --threshold 0.2
+    python -m sss.bench -k explain -k scoring
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+APP_SCRIPT = Path(__file__).resolve().parent.parent / "streamlit_app.py"
+
+# Benchmarks faster than this are too noisy to flag as regressions
+MIN_REGRESSION_US = 1.0
+
+
+def _answer_paths(n, seed=0):
+    from sss.quiz_bank import QUIZ_QUESTIONS
+    from sss.scoring import SKIP
+
+    rng = random.Random(seed)
+    choices = [[*range(len(q["options"])), SKIP] for q in QUIZ_QUESTIONS]
+    return [tuple(rng.choice(c) for c in choices) for _ in range(n)]
+
+
+def time_op(op, n_ops, repeat=5, warmup=1):
+    """Median seconds per operation; ``op()`` performs ``n_ops`` operations."""
+    for _ in range(warmup):
+        op()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        op()
+        times.append((time.perf_counter() - started) / n_ops)
+    return statistics.median(times)
+
+
+def bench_scoring(repeat):
+    import numpy as np
+
+    from sss.quiz_state import QuizRecord
+    from sss.scoring import normalize_pcts, raw_scores, score
+
+    paths = _answer_paths(2000)
+    totals = [tuple(raw_scores(p).tolist()) for p in paths]
+    batch = np.array(paths)
+
+    def normalize():
+        for t in totals:
+            normalize_pcts(*t)
+
+    def record():
+        for p in paths:
+            QuizRecord.from_answers(p).pcts()
+
+    return {
+        "scoring.normalize_pcts": time_op(normalize, len(totals), repeat),
+        "scoring.score_batch": time_op(lambda: score(batch), len(batch), repeat),
+        "scoring.quiz_record": time_op(record, len(paths), repeat),
+    }
+
+
+def bench_explain(repeat):
+    from sss.explain import answer_bullets
+    from sss.quiz_state import QuizRecord
+    from sss.scoring import LABELS, score
+
+    paths = _answer_paths(2000)
+    winners = [LABELS[w] for w in score(paths)[1].tolist()]
+    records = [QuizRecord.from_answers(p) for p in paths]
+
+    def quiz():
+        # What a session does: tally every answer as it is recorded, then explain
+        for p in paths:
+            QuizRecord.from_answers(p).explain()
+
+    def results_screen():
+        for record in records:
+            record.explain()
+
+    def bulk():
+        for w, p in zip(winners, paths):
+            answer_bullets(enumerate(p), w)
+
+    return {
+        "explain.quiz_record": time_op(quiz, len(paths), repeat),
+        "explain.results_screen": time_op(results_screen, len(records), repeat),
+        "explain.answer_bullets": time_op(bulk, len(paths), repeat),
+    }
+
+
+def bench_render(repeat):
+    import plotly.io as pio
+
+    from sss.charts import create_pie_chart, create_pie_svg
+    from sss.scoring import normalize_batch, raw_scores
+
+    pcts = [tuple(p) for p in normalize_batch(raw_scores(_answer_paths(50))).tolist()]
+
+    def build():
+        for p in pcts:
+            create_pie_chart(*p)
+
+    figs = [create_pie_chart(*p) for p in pcts]
+
+    def serialize():
+        for fig in figs:
+            pio.to_json(fig, validate=False)
+
+    def svg():
+        for p in pcts:
+            create_pie_svg(*p)
+
+    return {
+        "render.pie_chart_build": time_op(build, len(pcts), repeat),
+        "render.pie_chart_serialize": time_op(serialize, len(figs), repeat),
+        "render.pie_svg": time_op(svg, len(pcts), repeat),
+    }
+
+
+def _app_runs(script, timeout):
+    """One full quiz through AppTest, yielding ``(screen, rerun)`` callables in order."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(script), default_timeout=timeout)
+    yield "app.start", at.run
+    yield "app.start_click", at.button(key="start_btn").click().run
+    path = _answer_paths(1, seed=1)[0]
+    for q_idx in range(len(path)):
+        radio = at.radio(key=f"radio_{q_idx}")
+        radio.set_value(radio.options[path[q_idx] % len(radio.options)])
+        screen = "app.completed" if q_idx == len(path) - 1 else "app.mid_quiz"
+        yield screen, at.button(key=f"next_{q_idx}").click().run
+        if at.exception:
+            raise RuntimeError(f"app raised during benchmark: {at.exception}")
+
+
+def bench_app(repeat, script=APP_SCRIPT, timeout=60):
+    """Full-script rerun latency and peak traced memory per screen."""
+    # Don't fill the results store with benchmark quizzes, even one configured for the real app
+    results_db = os.environ.get("SSS_RESULTS_DB")
+    os.environ["SSS_RESULTS_DB"] = ""
+    # Streamlit logs deprecation and label warnings on every rerun
+    logging.disable(logging.WARNING)
+    try:
+        return _bench_app(repeat, script, timeout)
+    finally:
+        logging.disable(logging.NOTSET)
+        if results_db is None:
+            del os.environ["SSS_RESULTS_DB"]
+        else:
+            os.environ["SSS_RESULTS_DB"] = results_db
+
+
+def _bench_app(repeat, script, timeout):
+    # Warm-up quiz: imports, render caches and cache_resource singletons
+    for _, rerun in _app_runs(script, timeout):
+        rerun()
+
+    times, peaks = {}, {}
+    for i in range(repeat):
+        trace = i == repeat - 1  # tracemalloc slows things down; only trace the last pass
+        for screen, rerun in _app_runs(script, timeout):
+            if trace:
+                tracemalloc.start()
+            started = time.perf_counter()
+            rerun()
+            elapsed = time.perf_counter() - started
+            if trace:
+                peaks.setdefault(screen, []).append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            else:
+                times.setdefault(screen, []).append(elapsed)
+    results = {name: statistics.median(ts) for name, ts in times.items()}
+    memory = {name: max(ps) for name, ps in peaks.items()}
+    return results, memory
+
+
+SUITES = {"scoring": bench_scoring, "explain": bench_explain, "render": bench_render}
+
+
+def run(suites=None, repeat=5, app_repeat=4):
+    """Run the selected suites (all by default); returns the report dict."""
+    selected = suites or [*SUITES, "app"]
+    report = {
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "benchmarks": {},
+    }
+    for name in selected:
+        if name == "app":
+            times, memory = bench_app(max(app_repeat, 2))
+            for bench, seconds in times.items():
+                report["benchmarks"][bench] = {"us": round(seconds * 1e6, 3), "peak_kib": round(memory[bench] / 1024, 1)}
+        else:
+            for bench, seconds in SUITES[name](repeat).items():
+                report["benchmarks"][bench] = {"us": round(seconds * 1e6, 3), "ops_per_s": round(1 / seconds, 1)}
+    return report
+
+
+def compare(report, baseline, threshold):
+    """Human-readable regressions of ``report`` against ``baseline`` (empty if none)."""
+    problems = []
+    for name, result in report["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            continue
+        if result["us"] > before["us"] * (1 + threshold) and result["us"] - before["us"] > MIN_REGRESSION_US:
+            problems.append(f"{name}: {result['us']:.1f} us (baseline {before['us']:.1f} us)")
+        if "peak_kib" in result and "peak_kib" in before and result["peak_kib"] > before["peak_kib"] * (1 + threshold):
+            problems.append(f"{name}: peak {result['peak_kib']:.0f} KiB (baseline {before['peak_kib']:.0f} KiB)")
+    return problems
+
+
+def format_report(report):
+    lines = [f"{'benchmark':<30}{'us/op':>12}{'ops/s':>12}{'peak KiB':>10}"]
+    for name, r in report["benchmarks"].items():
+        ops = f"{r['ops_per_s']:>12.0f}" if "ops_per_s" in r else f"{'':>12}"
+        peak = f"{r['peak_kib']:>10.0f}" if "peak_kib" in r else ""
+        lines.append(f"{name:<30}{r['us']:>12.1f}{ops}{peak}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sss.bench", description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", "--suite", action="append", dest="suites", choices=[*SUITES, "app"],
+                        help="run only this suite (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--app-repeat", type=int, default=4, help="full quizzes per AppTest screen measurement")
+    parser.add_argument("--json", help="write the report here")
+    parser.add_argument("--baseline", help="report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown (default 0.2)")
+    args = parser.parse_args(argv)
+
+    report = run(args.suites, args.repeat, args.app_repeat)
+    print(format_report(report))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=1), encoding="utf-8")
+
+    if args.baseline:
+        problems = compare(report, json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.threshold)
+        print()
+        if problems:
+            print("benchmark regressions:\n  " + "\n  ".join(problems))
+            return 1
+        print(f"no benchmark regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
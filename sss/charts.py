@@ -0,0 +1,217 @@
+"""Live-classification chart and breakdown table, memoized across reruns.
+
+Building the Plotly figure is the most expensive step of a rerun, yet the chart
+only shows percentages to 0.1%.  Charts are therefore keyed on percentages
+quantized to that precision and kept in a bounded, process-wide LRU cache, so
+unchanged charts (start screen, after a Skip, other sessions at the same
+point) are reused instead of rebuilt.
+
+Two chart backends draw the same pie: ``"plotly"`` (an interactive
+``go.Figure``) and ``"svg"`` (a static inline SVG string rendered on the
+server, which needs neither plotly on the server nor Plotly.js in the page).
+Plotly and pandas are only imported when the plotly backend is used; the SVG
+backend pairs with a plain HTML breakdown table.
+"""
+
+import math
+import os
+import threading
+from collections import OrderedDict
+from html import escape
+
+from sss.scoring import LABELS
+
+CHART_BACKENDS = ("plotly", "svg")
+DEFAULT_CHART_BACKEND = os.environ.get("SSS_CHART_BACKEND", "plotly")
+
+SLICE_COLORS = ('#FF5252', '#00C853', '#FFD32F')
+
+# Percentages are shown with one decimal, so keys are tenths of a percent
+QUANTUM = 10
+
+
+def quantize_pcts(soup_pct, salad_pct, sandwich_pct):
+    """Cache key: the percentages in tenths of a percent."""
+    return tuple(int(round(p * QUANTUM)) for p in (soup_pct, salad_pct, sandwich_pct))
+
+
+class RenderCache:
+    """Thread-safe bounded LRU cache with hit/miss counters.
+
+    Streamlit runs every session in its own thread, so lookups and
+    evictions happen under a lock.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # Build outside the lock; a concurrent miss on the same key just builds twice
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+render_cache = RenderCache()
+
+
+def create_pie_chart(soup_pct, salad_pct, sandwich_pct):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[go.Pie(
+    labels=['SOUP', 'SALAD', 'SANDWICH'],
+    values=[soup_pct, salad_pct, sandwich_pct],
+    marker=dict(colors=list(SLICE_COLORS)),  # more vibrant
+    textposition='inside',
+    texttemplate='%{label}<br>%{value:.1f}%',
+    hovertemplate='<b>%{label}</b><br>%{value:.1f}%<extra></extra>',
+    textfont=dict(size=14, color='#222222'),  # dark text for readability
+    marker_line=dict(color='white', width=2)
+)])
+
+    fig.update_layout(
+        showlegend=False,
+        height=400,
+        font=dict(size=14),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=20, b=20)
+    )
+    return fig
+
+
+# SVG geometry: matches the plotly layout (400px high, 20px margins)
+SVG_SIZE = 400
+SVG_RADIUS = 180
+SVG_FONT = '"Open Sans", verdana, arial, sans-serif'
+# Slices narrower than this get no inside label (plotly shrinks them away too)
+SVG_MIN_LABEL_PCT = 4.0
+
+
+def _svg_point(angle, radius):
+    # Angles run counterclockwise from 12 o'clock, like plotly's pie defaults
+    c = SVG_SIZE / 2
+    return c - radius * math.sin(angle), c - radius * math.cos(angle)
+
+
+def create_pie_svg(soup_pct, salad_pct, sandwich_pct):
+    """Inline SVG version of ``create_pie_chart``.
+
+    Mirrors plotly's pie defaults: slices sorted largest first, starting at
+    12 o'clock and running counterclockwise, with white slice borders and
+    dark "LABEL / xx.x%" text inside each slice.
+    """
+    values = (soup_pct, salad_pct, sandwich_pct)
+    total = sum(values)
+    c = SVG_SIZE / 2
+    order = sorted(range(len(values)), key=lambda i: -values[i])
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {SVG_SIZE} {SVG_SIZE}" '
+        f'width="100%" height="{SVG_SIZE}" role="img" aria-label="Classification breakdown">'
+    ]
+    labels = []
+    start = 0.0
+    for i in order:
+        pct = values[i] / total * 100
+        sweep = values[i] / total * 2 * math.pi
+        title = f'<title>{escape(LABELS[i])} {values[i]:.1f}%</title>'
+        style = f'fill="{SLICE_COLORS[i]}" stroke="white" stroke-width="2"'
+        if sweep >= 2 * math.pi - 1e-9:
+            parts.append(f'<circle cx="{c}" cy="{c}" r="{SVG_RADIUS}" {style}>{title}</circle>')
+        elif sweep > 0:
+            x0, y0 = _svg_point(start, SVG_RADIUS)
+            x1, y1 = _svg_point(start + sweep, SVG_RADIUS)
+            large = 1 if sweep > math.pi else 0
+            parts.append(
+                f'<path d="M{c},{c} L{x0:.2f},{y0:.2f} A{SVG_RADIUS},{SVG_RADIUS} 0 {large} 0 {x1:.2f},{y1:.2f} Z" '
+                f'{style}>{title}</path>'
+            )
+        if pct >= SVG_MIN_LABEL_PCT:
+            # Centered in the slice; labels on a full circle sit in the middle
+            lx, ly = (c, c) if pct >= 99.9 else _svg_point(start + sweep / 2, SVG_RADIUS * 0.6)
+            labels.append(
+                f'<text x="{lx:.2f}" y="{ly:.2f}" text-anchor="middle" font-family=\'{SVG_FONT}\' '
+                f'font-size="14" fill="#222222" pointer-events="none">'
+                f'<tspan x="{lx:.2f}" dy="-0.2em">{escape(LABELS[i])}</tspan>'
+                f'<tspan x="{lx:.2f}" dy="1.2em">{values[i]:.1f}%</tspan></text>'
+            )
+        start += sweep
+    parts.extend(labels)
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def pie_svg(soup_pct, salad_pct, sandwich_pct):
+    """Memoized ``create_pie_svg`` built from the quantized percentages."""
+    key = quantize_pcts(soup_pct, salad_pct, sandwich_pct)
+    return render_cache.get_or_build(("svg", key), lambda: create_pie_svg(*(v / QUANTUM for v in key)))
+
+
+def pie_chart(soup_pct, salad_pct, sandwich_pct):
+    """Memoized ``create_pie_chart`` built from the quantized percentages.
+
+    The returned figure is shared between sessions and must not be modified.
+    """
+    key = quantize_pcts(soup_pct, salad_pct, sandwich_pct)
+    return render_cache.get_or_build(("pie", key), lambda: create_pie_chart(*(v / QUANTUM for v in key)))
+
+
+def _breakdown_frame(key):
+    import pandas as pd
+
+    return pd.DataFrame({
+        'Category': list(LABELS),
+        'Percentage': [f'{v / QUANTUM:.1f}%' for v in key]
+    })
+
+
+def breakdown_table(soup_pct, salad_pct, sandwich_pct):
+    """Memoized Category / Percentage table shown under the chart (shared, read-only)."""
+    key = quantize_pcts(soup_pct, salad_pct, sandwich_pct)
+    return render_cache.get_or_build(("breakdown", key), lambda: _breakdown_frame(key))
+
+
+def _breakdown_markup(key):
+    rows = ''.join(
+        f'<tr><td>{label}</td><td style="text-align:right">{v / QUANTUM:.1f}%</td></tr>'
+        for label, v in zip(LABELS, key)
+    )
+    return ('<table style="width:100%"><thead><tr><th>Category</th>'
+            f'<th style="text-align:right">Percentage</th></tr></thead><tbody>{rows}</tbody></table>')
+
+
+def breakdown_html(soup_pct, salad_pct, sandwich_pct):
+    """The breakdown table as static HTML, for the lightweight SVG backend."""
+    key = quantize_pcts(soup_pct, salad_pct, sandwich_pct)
+    return render_cache.get_or_build(("breakdown_html", key), lambda: _breakdown_markup(key))
@@ -0,0 +1,192 @@
+"""Bulk classification of answer-set files.
+
+Usage::
+
+    python -m sss.classify answers.jsonl -o results.jsonl
+    python -m sss.classify survey.csv -o results.csv --workers 8
+    python -m sss.classify answers.jsonl --table outcome_table.bin
+
+Input is streamed in fixed-size chunks (see ``sss.answer_files``); each chunk
+is scored in one batched call and written out before the next one is read, so
+memory stays flat however large the input is.  With ``--workers`` the input
+is cut into blocks of raw lines that are decoded, parsed, scored and formatted
+in a process pool, with a bounded number of blocks in flight; the main process
+only reads lines and writes results back in input order.  With ``--table``
+winners and percentages are looked up in the precomputed outcome table instead
+of scored.
+"""
+
+import argparse
+import collections
+import csv
+import io
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from sss.answer_files import detect_format, open_input, parse_block, read_blocks, read_chunks
+from sss.explain import answer_bullets
+from sss.outcome_table import load_table
+from sss.scoring import CATEGORIES, LABELS, score
+
+RESULT_COLUMNS = ["winner", *CATEGORIES, "highlights"]
+
+
+@lru_cache(maxsize=65536)
+def _highlights(answers, winner):
+    # Answer paths repeat a lot in real survey data, so memoize per path
+    return tuple(answer_bullets(enumerate(answers), winner))
+
+
+@lru_cache(maxsize=None)
+def _open_table(path):
+    # One memory map per process; tables are passed to workers by path
+    return load_table(path)
+
+
+def classify_chunk(fields, answers, table_path=None):
+    """Score one chunk; return one result dict per row (passthrough fields first)."""
+    if table_path is not None:
+        pcts, winner_idx = _open_table(table_path).lookup_batch(answers)
+    else:
+        pcts, winner_idx = score(answers)
+    results = []
+    for extra, row, row_pcts, w in zip(fields, answers.tolist(), pcts.tolist(), winner_idx.tolist()):
+        winner = LABELS[w]
+        result = dict(extra)
+        result["winner"] = winner
+        for cat, pct in zip(CATEGORIES, row_pcts):
+            result[cat] = round(pct, 2)
+        result["highlights"] = list(_highlights(tuple(row), winner))
+        results.append(result)
+    return results
+
+
+def _format_jsonl(results):
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in results)
+
+
+def _format_csv(results, columns):
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=columns, extrasaction="ignore", lineterminator="\n")
+    for r in results:
+        writer.writerow({**r, "highlights": " | ".join(r["highlights"])})
+    return buf.getvalue()
+
+
+def _render_chunk(fields, answers, out_fmt, columns, table_path):
+    # Runs in worker processes too: format there so only text crosses back
+    results = classify_chunk(fields, answers, table_path)
+    if out_fmt == "csv":
+        return _format_csv(results, columns), len(results)
+    return _format_jsonl(results), len(results)
+
+
+def _render_block(block, in_fmt, errors, out_fmt, columns, table_path):
+    # Worker side of --workers: parse the raw lines too, so the main process never decodes input
+    fields, answers, skipped = parse_block(in_fmt, *block, errors=errors)
+    text, n = _render_chunk(fields, answers, out_fmt, columns, table_path) if fields else ("", 0)
+    return text, n, skipped
+
+
+def _csv_columns(first_fields):
+    return [k for k in first_fields if k not in RESULT_COLUMNS] + RESULT_COLUMNS
+
+
+def classify_stream(in_stream, out_stream, in_fmt, out_fmt, chunk_size=10000, workers=1,
+                    errors="raise", on_error=None, table_path=None):
+    """Classify everything in ``in_stream`` and write results to ``out_stream``.
+
+    Returns the number of rows written.
+    """
+    if table_path is not None:
+        # Build (or rebuild) the table once here rather than racing in every worker
+        _open_table(table_path)
+    columns = None
+    written = 0
+
+    def header_for(fields):
+        nonlocal columns
+        if columns is None and out_fmt == "csv":
+            columns = _csv_columns(fields[0])
+            csv.writer(out_stream, lineterminator="\n").writerow(columns)
+        return columns
+
+    if workers <= 1:
+        for fields, answers in read_chunks(in_stream, in_fmt, chunk_size=chunk_size, errors=errors, on_error=on_error):
+            text, n = _render_chunk(fields, answers, out_fmt, header_for(fields), table_path)
+            out_stream.write(text)
+            written += n
+        return written
+
+    def write_back(text, n, skipped):
+        nonlocal written
+        if on_error is not None:
+            for line_no, exc in skipped:
+                on_error(line_no, exc)
+        out_stream.write(text)
+        written += n
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for block in read_blocks(in_stream, in_fmt, block_size=chunk_size):
+            if out_fmt == "csv" and columns is None:
+                # CSV columns come from the first valid record, so parse blocks here until one turns up
+                fields, answers, skipped = parse_block(in_fmt, *block, errors=errors)
+                text, n = _render_chunk(fields, answers, out_fmt, header_for(fields), table_path) if fields else ("", 0)
+                write_back(text, n, skipped)
+                continue
+            pending.append(pool.submit(_render_block, block, in_fmt, errors, out_fmt, columns, table_path))
+            # Keep at most two blocks per worker in flight so memory stays bounded
+            while len(pending) >= 2 * workers:
+                write_back(*pending.popleft().result())
+        while pending:
+            write_back(*pending.popleft().result())
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sss.classify", description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="JSONL or CSV answer file ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--input-format", choices=["jsonl", "csv"], help="default: from the file extension")
+    parser.add_argument("--output-format", choices=["jsonl", "csv"], help="default: from the file extension")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="rows scored per batch")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: 1, in-process)")
+    parser.add_argument("--skip-invalid", action="store_true", help="drop invalid rows instead of stopping")
+    parser.add_argument("--table", help="precomputed outcome table to look results up in (built if missing)")
+    args = parser.parse_args(argv)
+
+    in_fmt = args.input_format or detect_format(args.input)
+    out_fmt = args.output_format or detect_format(args.output)
+    invalid = 0
+
+    def on_error(line_no, exc):
+        nonlocal invalid
+        invalid += 1
+        print(f"skipping line {line_no}: {exc}", file=sys.stderr)
+
+    in_stream = open_input(args.input)
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        written = classify_stream(
+            in_stream, out_stream, in_fmt, out_fmt,
+            chunk_size=args.chunk_size, workers=args.workers,
+            errors="skip" if args.skip_invalid else "raise", on_error=on_error,
+            table_path=args.table,
+        )
+    except ValueError as e:
+        parser.exit(2, f"error: {e}\n")
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+
+    print(f"classified {written} rows" + (f", skipped {invalid} invalid" if invalid else ""), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
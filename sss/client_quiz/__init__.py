@@ -0,0 +1,81 @@
+"""Browser-side quiz: the whole question flow as one custom component.
+
+The component receives the questions, the compiled weights and the reason
+strings once, then asks every question, scores the answers and redraws the
+pie in the browser without talking to the server.  Only the finished answer
+vector comes back (as the component value), where it is parsed, scored and
+logged with the same Python functions the server-side quiz uses, so both
+modes produce identical results.
+
+The frontend is a single static ``frontend/index.html`` speaking Streamlit's
+component message protocol directly; there is no build step.  The app
+imports this module only for sessions in client mode (see ``sss.quiz_modes``).
+"""
+
+import logging
+from functools import lru_cache
+from pathlib import Path
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from sss.answer_files import parse_answers
+from sss.charts import SLICE_COLORS
+from sss.quiz_bank import QUIZ_QUESTIONS
+from sss.scoring import CATEGORIES, LABELS, MIN_SCORE, SKIP, START_SCORE, WEIGHTS, raw_scores
+
+logger = logging.getLogger(__name__)
+
+_component = components.declare_component("client_quiz", path=str(Path(__file__).parent / "frontend"))
+
+
+@lru_cache(maxsize=None)
+def quiz_payload():
+    """Everything the browser needs to run the quiz, built once per process."""
+    return {
+        "questions": [
+            {
+                "question": q["question"],
+                "options": [opt["text"] for opt in q["options"]],
+                # Per option: reason strings in CATEGORIES order
+                "reasons": [[opt.get(f"reason_{c}", "") for c in CATEGORIES] for opt in q["options"]],
+            }
+            for q in QUIZ_QUESTIONS
+        ],
+        "weights": WEIGHTS.tolist(),
+        "skip": SKIP,
+        "labels": list(LABELS),
+        "colors": list(SLICE_COLORS),
+        "start_score": START_SCORE,
+        "min_score": MIN_SCORE,
+    }
+
+
+def client_quiz(key, on_submit, height=620):
+    """Render the browser-side quiz.
+
+    ``on_submit(raw_answers)`` runs as a widget callback, before the rerun the
+    submission triggers, so the app can switch to its results screen in that
+    same run.  Use a new ``key`` to start a fresh quiz.
+    """
+    def submitted():
+        value = st.session_state.get(key)
+        if value is not None:
+            on_submit(value.get("answers") if isinstance(value, dict) else value)
+
+    _component(quiz=quiz_payload(), key=key, default=None, on_change=submitted, height=height)
+
+
+def score_submission(raw_answers):
+    """Parse and score a submitted answer vector.
+
+    Returns ``(answers, totals)``: option indices (``SKIP`` for skipped
+    questions) and the raw soup / salad / sandwich totals, summed exactly as
+    the server-side quiz does.  Raises ``ValueError`` for malformed input.
+    """
+    if not isinstance(raw_answers, list):
+        raise ValueError("expected a list of answers")
+    answers = parse_answers(raw_answers)
+    totals = tuple(raw_scores(answers).tolist())
+    logger.info("client quiz result: answers=%s totals=%s", answers, totals)
+    return answers, totals
@@ -0,0 +1,240 @@
+"""Explanations: which answers pushed the result and why.
+
+``reasoning_data`` is a list of ``(q_idx, option_text, impacts, option)``
+tuples, one per answered or skipped question, as built by the quiz.
+
+``ReasonTally`` produces the per-category reasons, summary and bullets from
+``(q_idx, o_idx)`` answers without re-scanning anything: impacts and cleaned
+reason texts come from ``REASON_INDEX``, built once at import, and the top
+reasons per category are kept up to date as answers are added.  The original
+``reasoning_data`` helpers it replaces are kept in ``sss.explain_reference``,
+which also checks the two agree.
+"""
+
+from collections import namedtuple
+
+from sss.quiz_bank import QUIZ_QUESTIONS
+from sss.scoring import CATEGORIES, LABELS, SKIP, option_impacts
+
+SKIPPED_ENTRY_TEXT = "<skipped>"
+
+
+def _build_entry(q_idx, o_idx):
+    if o_idx == SKIP:
+        return (q_idx, SKIPPED_ENTRY_TEXT, {"soup": 0, "salad": 0, "sandwich": 0}, {})
+    option = QUIZ_QUESTIONS[q_idx]["options"][o_idx]
+    return (q_idx, option.get("text"), option_impacts(q_idx, o_idx), option)
+
+
+# Entries are shared read-only between sessions, one per (question, option or skip)
+_ENTRIES = [
+    [_build_entry(q_idx, o_idx) for o_idx in [*range(len(q["options"])), SKIP]]
+    for q_idx, q in enumerate(QUIZ_QUESTIONS)
+]
+
+
+def reasoning_entry(q_idx, o_idx):
+    """The reasoning tuple the quiz records for one answer (or a skip)."""
+    return _ENTRIES[q_idx][-1 if o_idx == SKIP else o_idx]
+
+
+def reasoning_from_answers(answers):
+    """Rebuild ``reasoning_data`` for a complete answer vector."""
+    return [reasoning_entry(q_idx, o_idx) for q_idx, o_idx in enumerate(answers)]
+
+
+def reasoning_entries():
+    """Every shared reasoning tuple, per question with the skip last (read-only)."""
+    return _ENTRIES
+
+
+# Reason index --------------------------------------------------------------
+
+def _clean(text):
+    if not text:
+        return ""
+    return text.replace('—', ',').replace('*', '').strip()
+
+
+def _index_entry(q_idx, o_idx, c_idx):
+    # (impact, raw reason or None when the option has none, cleaned reason text;
+    # the option text when it has no reason for the category)
+    if o_idx == SKIP:
+        return (0, None, "")
+    option = QUIZ_QUESTIONS[q_idx]["options"][o_idx]
+    key = f"reason_{CATEGORIES[c_idx]}"
+    return (option_impacts(q_idx, o_idx)[CATEGORIES[c_idx]], option.get(key) if key in option else None,
+            _clean(option.get(key) or option.get("text")))
+
+
+# REASON_INDEX[q_idx][o_idx][c_idx], with the skip as the last option slot
+REASON_INDEX = tuple(
+    tuple(
+        tuple(_index_entry(q_idx, o_idx, c_idx) for c_idx in range(len(CATEGORIES)))
+        for o_idx in [*range(len(q["options"])), SKIP]
+    )
+    for q_idx, q in enumerate(QUIZ_QUESTIONS)
+)
+
+# Per (question, option): the raw reasons, and the contributions of the
+# non-zero impacts as (slot, (magnitude, text)) with slot = 2 * category + side,
+# side 0 supporting / 1 opposing; the pairs are shared by every tally
+_RAW_REASONS = tuple(
+    tuple(tuple((c_idx, raw) for c_idx, (_, raw, _) in enumerate(entry) if raw is not None) for entry in q)
+    for q in REASON_INDEX
+)
+_CONTRIBUTIONS = tuple(
+    tuple(
+        tuple((2 * c_idx + (0 if impact > 0 else 1), (abs(impact), text))
+              for c_idx, (impact, _, text) in enumerate(entry) if impact != 0)
+        for entry in q
+    )
+    for q in REASON_INDEX
+)
+
+Explanation = namedtuple("Explanation", "winner reasons summary bullets")
+
+# How many reasons the summary and the bullets draw from each list
+_SUMMARY_K = 2
+_BULLETS_K = 3
+
+# ReasonTally._top holds a window of _SUMMARY_K pairs per slot, then one of
+# _BULLETS_K pairs per slot for the bullets
+_N_SLOTS = 2 * len(CATEGORIES)
+_BULLETS_AT = _SUMMARY_K * _N_SLOTS
+
+
+def _offer(top, start, k, pair):
+    """Insert a (magnitude, text) pair into the descending window ``top[start:start + k]``.
+
+    Empty places are None; equal magnitudes keep arrival order.
+    """
+    end = start + k
+    i = end
+    while i > start and (top[i - 1] is None or top[i - 1][0] < pair[0]):
+        i -= 1
+    if i < end:
+        top[i + 1:end] = top[i:end - 1]
+        top[i] = pair
+
+
+def _insert(top, k, pair):
+    """``_offer`` for a plain descending top-k list."""
+    i = len(top)
+    while i and top[i - 1][0] < pair[0]:
+        i -= 1
+    if i < k:
+        top.insert(i, pair)
+        del top[k:]
+
+
+def _window(top, start, k):
+    return [pair for pair in top[start:start + k] if pair is not None]
+
+
+class ReasonTally:
+    """Reasons, summary and bullets for a growing list of answers.
+
+    Matches ``get_winner_analysis``, ``build_two_reason_summary`` and
+    ``build_three_bullets`` over the equivalent ``reasoning_data``, but every
+    ``add`` is constant work and reading the results is a few lookups.  The
+    tally keeps references to shared pairs only, in two small flat arrays.
+    """
+
+    __slots__ = ("_answers", "_top")
+
+    def __init__(self, answers=()):
+        # (q_idx, option slot) byte pairs in answer order, the skip as the last slot
+        self._answers = bytearray()
+        self._top = [None] * (_BULLETS_AT + _BULLETS_K * _N_SLOTS)
+        for q_idx, o_idx in answers:
+            self.add(q_idx, o_idx)
+
+    def add(self, q_idx, o_idx):
+        """Account for one answer (``SKIP`` for a skipped question)."""
+        contributions = _CONTRIBUTIONS[q_idx]
+        o_slot = len(contributions) - 1 if o_idx == SKIP else o_idx
+        self._answers += bytes((q_idx, o_slot))
+        top = self._top
+        for slot, pair in contributions[o_slot]:
+            _offer(top, _SUMMARY_K * slot, _SUMMARY_K, pair)
+            if pair[1]:
+                _offer(top, _BULLETS_AT + _BULLETS_K * slot, _BULLETS_K, pair)
+
+    @property
+    def reasons(self):
+        """Per category, the raw reason strings of every answer, in answer order."""
+        reasons = tuple([] for _ in CATEGORIES)
+        answers = self._answers
+        for i in range(0, len(answers), 2):
+            for c_idx, raw in _RAW_REASONS[answers[i]][answers[i + 1]]:
+                reasons[c_idx].append(raw)
+        return reasons
+
+    def _sides(self, winner, start, k):
+        start += 2 * k * LABELS.index(winner)
+        return _window(self._top, start, k), _window(self._top, start + k, k)
+
+    def summary(self, winner):
+        """``build_two_reason_summary`` for ``winner`` (a label from ``LABELS``)."""
+        supporting, opposing = self._sides(winner, 0, _SUMMARY_K)
+        if len(supporting) >= 2:
+            return f"{supporting[0][1]}. {supporting[1][1]}."
+        if len(supporting) == 1 and opposing:
+            return f"Despite {opposing[0][1]}, because {supporting[0][1]}."
+        if len(supporting) == 1:
+            return f"{supporting[0][1]}."
+        if len(opposing) >= 2:
+            return f"Despite {opposing[0][1]}, because {opposing[1][1]}."
+        if opposing:
+            return f"{opposing[0][1]}."
+        return "No concise reasons available."
+
+    def bullets(self, winner):
+        """``build_three_bullets`` for ``winner`` (a label from ``LABELS``)."""
+        supporting, opposing = self._sides(winner, _BULLETS_AT, _BULLETS_K)
+        bullets = [text for _, text in supporting]
+        bullets += [text for _, text in opposing[:_BULLETS_K - len(bullets)]]
+        return bullets or ["No strong indicators were recorded."]
+
+    def explain(self, pcts):
+        """Winner label for the given percentages plus its reasons, summary and bullets."""
+        # max() keeps the first of equal percentages, like get_winner_analysis
+        winner = LABELS[max(range(len(LABELS)), key=lambda c_idx: pcts[c_idx])]
+        return Explanation(winner, self.reasons, self.summary(winner), self.bullets(winner))
+
+
+# Per category, question and option: a (supporting, opposing) pair holding the
+# bullet-worthy (magnitude, text) on its side and None on the other
+_BULLET_CANDIDATES = tuple(
+    tuple(
+        tuple(
+            (None, None) if impact == 0 or not text else
+            (((impact, text), None) if impact > 0 else (None, (-impact, text)))
+            for impact, _, text in (entry[c_idx] for entry in q)
+        )
+        for q in REASON_INDEX
+    )
+    for c_idx in range(len(CATEGORIES))
+)
+
+
+def answer_bullets(answers, winner):
+    """Up to three bullets for ``winner`` from ``(q_idx, o_idx)`` answers, in the order given.
+
+    The strongest supporting reasons first, topped up with the strongest
+    opposing ones; equal impacts keep answer order.  Only the winner's
+    precomputed candidates are looked at, in one pass.
+    """
+    candidates = _BULLET_CANDIDATES[LABELS.index(winner)]
+    supporting, opposing = [], []
+    for q_idx, o_idx in answers:
+        sup, opp = candidates[q_idx][-1 if o_idx == SKIP else o_idx]
+        if sup is not None:
+            _insert(supporting, _BULLETS_K, sup)
+        elif opp is not None:
+            _insert(opposing, _BULLETS_K, opp)
+    bullets = [text for _, text in supporting]
+    bullets += [text for _, text in opposing[:_BULLETS_K - len(bullets)]]
+    return bullets or ["No strong indicators were recorded."]
+
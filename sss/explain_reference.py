@@ -0,0 +1,141 @@
+"""Reference explanation code and the check that ``ReasonTally`` matches it.
+
+The results screen used to run ``get_winner_analysis``,
+``build_two_reason_summary`` and ``build_three_bullets`` over the session's
+``reasoning_data`` after every answer had been given.  They are kept here,
+unchanged in behaviour, as the definition ``sss.explain`` has to agree with.
+
+``python -m sss.explain_reference`` replays random quizzes (skips and any
+question order included) through both and exits non-zero on the first
+difference.
+"""
+
+import argparse
+import random
+import sys
+
+from sss.explain import ReasonTally, _clean, answer_bullets, reasoning_entry
+from sss.quiz_bank import QUIZ_QUESTIONS
+from sss.scoring import N_QUESTIONS, SKIP, normalize_pcts, raw_scores
+
+
+def get_winner_analysis(soup_pct, salad_pct, sandwich_pct, reasoning_data):
+    """Winner label plus the soup / salad / sandwich reasons of every answer."""
+    percentages = {"SOUP": soup_pct, "SALAD": salad_pct, "SANDWICH": sandwich_pct}
+    winner = max(percentages, key=percentages.get)
+    reasons = {"soup": [], "salad": [], "sandwich": []}
+    for q_idx, option_text, _impacts, opt_obj in reasoning_data:
+        selected_option = opt_obj if isinstance(opt_obj, dict) and opt_obj else None
+        if selected_option is None:
+            selected_option = next((o for o in QUIZ_QUESTIONS[q_idx]["options"] if o["text"] == option_text), None)
+        if selected_option:
+            for cat, found in reasons.items():
+                if f"reason_{cat}" in selected_option:
+                    found.append(selected_option[f"reason_{cat}"])
+    return winner, reasons["soup"], reasons["salad"], reasons["sandwich"]
+
+
+def _ranked_reasons(winner, reasoning_data, drop_empty):
+    key = winner.lower()
+    supporting, opposing = [], []
+    for _q_idx, option_text, impacts, opt_obj in reasoning_data:
+        if not impacts or key not in impacts:
+            continue
+        val = impacts.get(key, 0)
+        reason_text = opt_obj.get(f"reason_{key}") if isinstance(opt_obj, dict) else None
+        reason_text = _clean(reason_text or option_text)
+        if drop_empty and not reason_text:
+            continue
+        if val > 0:
+            supporting.append((val, reason_text))
+        elif val < 0:
+            opposing.append((abs(val), reason_text))
+    supporting.sort(reverse=True, key=lambda x: x[0])
+    opposing.sort(reverse=True, key=lambda x: x[0])
+    return supporting, opposing
+
+
+def build_two_reason_summary(winner, reasoning_data):
+    """Two concise reasons: two supporting ones, or one opposing and one supporting."""
+    supporting, opposing = _ranked_reasons(winner, reasoning_data, drop_empty=False)
+    if len(supporting) >= 2:
+        return f"{supporting[0][1]}. {supporting[1][1]}."
+    if len(supporting) == 1:
+        return f"Despite {opposing[0][1]}, because {supporting[0][1]}." if opposing else f"{supporting[0][1]}."
+    if len(opposing) >= 2:
+        return f"Despite {opposing[0][1]}, because {opposing[1][1]}."
+    if opposing:
+        return f"{opposing[0][1]}."
+    return "No concise reasons available."
+
+
+def build_three_bullets(winner, reasoning_data):
+    """Up to three short bullets: supporting reasons first, then opposing ones."""
+    supporting, opposing = _ranked_reasons(winner, reasoning_data, drop_empty=True)
+    bullets = [txt for _, txt in supporting[:3]]
+    bullets += [txt for _, txt in opposing[:3 - len(bullets)]]
+    return bullets or ["No strong indicators were recorded."]
+
+
+def random_path(rng):
+    """A complete quiz as ``(q_idx, o_idx)`` pairs in a random asked order, skips included."""
+    order = rng.sample(range(N_QUESTIONS), N_QUESTIONS)
+    return [(q_idx, rng.choice([*range(len(QUIZ_QUESTIONS[q_idx]["options"])), SKIP])) for q_idx in order]
+
+
+def compare(path):
+    """Fields where ``ReasonTally`` and ``answer_bullets`` disagree with the reference (empty if none)."""
+    answers = [None] * N_QUESTIONS
+    for q_idx, o_idx in path:
+        answers[q_idx] = o_idx
+    pcts = normalize_pcts(*raw_scores(answers).tolist())
+    reasoning_data = [reasoning_entry(q_idx, o_idx) for q_idx, o_idx in path]
+    winner, *reasons = get_winner_analysis(*pcts, reasoning_data)
+    expected = {
+        "winner": winner,
+        "reasons": [list(r) for r in reasons],
+        "summary": build_two_reason_summary(winner, reasoning_data),
+        "bullets": build_three_bullets(winner, reasoning_data),
+    }
+    explanation = ReasonTally(path).explain(pcts)
+    got = {
+        "winner": explanation.winner,
+        "reasons": [list(r) for r in explanation.reasons],
+        "summary": explanation.summary,
+        "bullets": explanation.bullets,
+    }
+    diffs = [name for name in expected if got[name] != expected[name]]
+    if answer_bullets(path, winner) != expected["bullets"]:
+        diffs.append("answer_bullets")
+    return diffs
+
+
+def check(n_paths=20000, seed=0):
+    """Compare ``n_paths`` random quizzes; the first mismatching path and fields, or None."""
+    rng = random.Random(seed)
+    for _ in range(n_paths):
+        path = random_path(rng)
+        diffs = compare(path)
+        if diffs:
+            return path, diffs
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sss.explain_reference",
+                                     description="Check the explanation code against the reference helpers.")
+    parser.add_argument("--paths", type=int, default=20000, help="random quizzes to compare")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    mismatch = check(args.paths, args.seed)
+    if mismatch is not None:
+        path, diffs = mismatch
+        print(f"MISMATCH in {', '.join(diffs)} for {path}")
+        return 1
+    print(f"{args.paths} quizzes: ok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+"""Fit the per-option impacts from labeled answers.
+
+The model is the scorer itself: a food's category logits are the summed
+impacts of its answers, and training minimizes the softmax cross-entropy of
+the true category with mini-batch Adam.  Training starts from the hand-tuned
+impacts in ``QUIZ_QUESTIONS``; skip and padding slots stay at zero.
+
+Labeled data is any answer-set file (see ``sss.answer_files``) with a
+``label`` field (``soup`` / ``salad`` / ``sandwich``, any case, or 0-2).  One
+streaming pass packs it into a binary row file (10 answer bytes and a label
+byte per row); every epoch then reads that file in memory-mapped windows,
+in random order and shuffled within each window, so datasets larger than RAM
+work.  A fixed hash of the row number holds out a
+share of the rows for the accuracy report.
+
+The fitted impacts are rescaled to the range of the hand-tuned ones, rounded
+to integers (the app sums integer impacts, see ``sss.scoring.raw_scores``)
+and written as a weight table stamped with its ``weights_digest``.  The app
+uses it when started with ``SSS_WEIGHTS`` pointing at the file; the outcome
+table rebuilds itself for the new digest.
+
+Usage::
+
+    python -m sss.fit_weights train labeled.jsonl -o weights.json
+    python -m sss.fit_weights report labeled.jsonl --weights weights.json
+    python -m sss.fit_weights synthetic -n 1000000 -o labeled.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from sss.answer_files import detect_format, open_input, read_chunks
+from sss.quiz_bank import QUIZ_QUESTIONS
+from sss.scoring import (CATEGORIES, LABELS, N_QUESTIONS, SCORING_VERSION, SKIP, compile_weights, load_weights,
+                         option_mask, score, weights_digest)
+
+N_CHOICES = SKIP + 1
+# The hand-tuned impacts of QUIZ_QUESTIONS, whatever table SSS_WEIGHTS makes the app use
+BUILT_IN_WEIGHTS = compile_weights(QUIZ_QUESTIONS)
+ROW_BYTES = N_QUESTIONS + 1
+
+# Hand-tuned impacts divided by this are the starting logits
+TEMPERATURE = 10.0
+
+# Mini-batches shuffled together in memory
+SHUFFLE_WINDOW = 32
+
+_LABEL_LOOKUP = {**{c: i for i, c in enumerate(CATEGORIES)}, **{str(i): i for i in range(len(CATEGORIES))}}
+
+
+def parse_label(value):
+    label = _LABEL_LOOKUP.get(str(value).strip().lower())
+    if label is None:
+        raise ValueError(f"unknown label {value!r}")
+    return label
+
+
+# Data --------------------------------------------------------------------
+
+def pack_rows(stream, fmt, out, label_field="label"):
+    """Append ``answers + label`` byte rows for every valid labeled record to ``out``; returns (rows, dropped)."""
+    n_rows = n_dropped = 0
+    for fields, answers in read_chunks(stream, fmt, errors="skip"):
+        labels = np.empty(len(fields), dtype=np.int8)
+        keep = np.ones(len(fields), dtype=bool)
+        for i, extra in enumerate(fields):
+            try:
+                labels[i] = parse_label(extra.get(label_field))
+            except ValueError:
+                keep[i] = False
+        rows = np.concatenate([answers[keep], labels[keep, None]], axis=1)
+        out.write(np.ascontiguousarray(rows, dtype=np.int8).tobytes())
+        n_rows += len(rows)
+        n_dropped += int((~keep).sum())
+    return n_rows, n_dropped
+
+
+def open_rows(path):
+    """Memory-mapped (n, ROW_BYTES) view of a packed row file."""
+    n_rows = os.path.getsize(path) // ROW_BYTES
+    if not n_rows:
+        return np.zeros((0, ROW_BYTES), dtype=np.int8)
+    return np.memmap(path, dtype=np.int8, mode="r", shape=(n_rows, ROW_BYTES))
+
+
+def holdout_mask(start, stop, fraction):
+    """Rows start..stop-1 that belong to the held-out set (a fixed hash of the row number)."""
+    rows = np.arange(start, stop, dtype=np.uint64)
+    hashed = (rows * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(40)
+    return hashed < np.uint64(int(fraction * (1 << 24)))
+
+
+def iter_blocks(rows, block_size, fraction, held_out, rng=None):
+    """``(answers, labels)`` blocks of the training or held-out rows, in shuffled block order if rng is given."""
+    starts = np.arange(0, len(rows), block_size)
+    if rng is not None:
+        rng.shuffle(starts)
+    for start in starts.tolist():
+        stop = min(start + block_size, len(rows))
+        block = np.asarray(rows[start:stop])
+        keep = holdout_mask(start, stop, fraction) == held_out
+        if keep.any():
+            yield block[keep, :N_QUESTIONS].astype(np.intp), block[keep, N_QUESTIONS].astype(np.intp)
+
+
+# Training ----------------------------------------------------------------
+
+def _slots(answers):
+    # Flat (question, option) slot per answer, so a gather over (N_QUESTIONS * N_CHOICES, categories) scores rows
+    return answers + N_CHOICES * np.arange(N_QUESTIONS)
+
+
+def _logits(params, slots):
+    return params[slots].sum(axis=1)
+
+
+def _batches(rows, batch_size, holdout, rng):
+    # Shuffle rows within windows of SHUFFLE_WINDOW batches, read in random order: sorted input
+    # files still give mixed batches while only one window is in memory
+    for answers, labels in iter_blocks(rows, batch_size * SHUFFLE_WINDOW, holdout, held_out=False, rng=rng):
+        order = rng.permutation(len(labels))
+        for start in range(0, len(order), batch_size):
+            picked = order[start:start + batch_size]
+            yield answers[picked], labels[picked]
+
+
+def fit(rows, epochs=3, batch_size=8192, lr=0.02, l2=1e-6, holdout=0.1, seed=0, init=BUILT_IN_WEIGHTS, log=None):
+    """Float impacts (in logit units) fitted on the training rows."""
+    mask = option_mask(QUIZ_QUESTIONS).reshape(-1, 1)
+    params = (np.asarray(init, dtype=np.float64) / TEMPERATURE).reshape(-1, len(CATEGORIES)) * mask
+    m = np.zeros_like(params)
+    v = np.zeros_like(params)
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    rng = np.random.default_rng(seed)
+    step = 0
+    n_slots = params.shape[0]
+    for epoch in range(epochs):
+        started, seen, loss_sum = time.perf_counter(), 0, 0.0
+        for answers, labels in _batches(rows, batch_size, holdout, rng):
+            slots = _slots(answers)
+            logits = _logits(params, slots)
+            logits -= logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            loss_sum += -np.log(probs[np.arange(len(labels)), labels] + 1e-12).sum()
+            probs[np.arange(len(labels)), labels] -= 1.0
+            probs /= len(labels)
+            # Every answer's slot receives its row's gradient
+            flat = slots.ravel()
+            grad = np.stack([np.bincount(flat, weights=np.repeat(probs[:, c], N_QUESTIONS), minlength=n_slots)
+                             for c in range(len(CATEGORIES))], axis=1)
+            grad = (grad + l2 * params) * mask
+            step += 1
+            m = beta1 * m + (1 - beta1) * grad
+            v = beta2 * v + (1 - beta2) * grad * grad
+            params -= lr * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+            params *= mask
+            seen += len(labels)
+        if log is not None:
+            log(f"epoch {epoch + 1}/{epochs}: {seen} rows, loss {loss_sum / max(seen, 1):.4f}, "
+                f"{time.perf_counter() - started:.1f} s")
+    return params.reshape(N_QUESTIONS, N_CHOICES, len(CATEGORIES))
+
+
+def to_weight_table(params, reference=BUILT_IN_WEIGHTS):
+    """Integer impacts on the scale of ``reference`` (same largest magnitude), skip slots zero."""
+    scale = np.abs(reference).max() / max(np.abs(params).max(), 1e-12)
+    weights = np.rint(params * scale).astype(np.int16)
+    weights[~option_mask(QUIZ_QUESTIONS)] = 0
+    return weights
+
+
+def evaluate(rows, weight_tables, holdout=0.1, block_size=65536):
+    """Held-out accuracy and confusion matrix (true x predicted) per named weight table, scored like the app."""
+    confusion = {name: np.zeros((len(LABELS), len(LABELS)), dtype=np.int64) for name in weight_tables}
+    for answers, labels in iter_blocks(rows, block_size, holdout, held_out=True):
+        for name, weights in weight_tables.items():
+            _pcts, predicted = score(answers, weights)
+            np.add.at(confusion[name], (labels, predicted), 1)
+    report = {}
+    for name, matrix in confusion.items():
+        total = int(matrix.sum())
+        report[name] = {
+            "rows": total,
+            "accuracy": float(np.trace(matrix) / total) if total else 0.0,
+            "recall": {label: float(matrix[i, i] / matrix[i].sum()) if matrix[i].sum() else 0.0
+                       for i, label in enumerate(LABELS)},
+            "confusion": matrix.tolist(),
+        }
+    return report
+
+
+def save_weights(weights, path, report=None, trained=None):
+    data = {
+        "scoring_version": SCORING_VERSION,
+        "weights_digest": weights_digest(weights),
+        "weights": weights.tolist(),
+        "trained": trained or {},
+        "report": report or {},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+
+
+def format_report(report):
+    lines = [f"{'weights':<12}{'held out':>10}{'accuracy':>10}" + "".join(f"{label:>10}" for label in LABELS)]
+    for name, r in report.items():
+        lines.append(f"{name:<12}{r['rows']:>10}{r['accuracy']:>10.2%}"
+                     + "".join(f"{r['recall'][label]:>10.2%}" for label in LABELS))
+    return "\n".join(lines) + "\n(per-category columns are recall)"
+
+
+# Synthetic data ------------------------------------------------------------
+
+def write_synthetic(path, n, seed=0, noise=8.0, skip_rate=0.1, chunk_size=100000):
+    """Labeled rows from a noisy variant of the hand-tuned impacts, for exercising the pipeline."""
+    rng = np.random.default_rng(seed)
+    mask = option_mask(QUIZ_QUESTIONS)[..., None]
+    truth = (BUILT_IN_WEIGHTS + rng.normal(0, noise, BUILT_IN_WEIGHTS.shape)) * mask / TEMPERATURE
+    with open(path, "w", encoding="utf-8") as f:
+        for start in range(0, n, chunk_size):
+            size = min(chunk_size, n - start)
+            answers = rng.integers(0, SKIP, size=(size, N_QUESTIONS))
+            answers[rng.random((size, N_QUESTIONS)) < skip_rate] = SKIP
+            logits = truth.reshape(-1, len(CATEGORIES))[_slots(answers)].sum(axis=1)
+            probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probs /= probs.sum(axis=1, keepdims=True)
+            labels = (probs.cumsum(axis=1) < rng.random((size, 1))).sum(axis=1)
+            f.writelines(
+                json.dumps({"label": CATEGORIES[label], "answers": [None if o == SKIP else o for o in row]}) + "\n"
+                for row, label in zip(answers.tolist(), labels.tolist())
+            )
+
+
+def _packed(args, log):
+    """Path of the packed row file for args.input (packed now unless --rows is an existing file)."""
+    if args.rows and os.path.exists(args.rows):
+        return args.rows, False
+    path = args.rows
+    if not path:
+        fd, path = tempfile.mkstemp(suffix=".rows")
+        os.close(fd)
+    started = time.perf_counter()
+    stream = open_input(args.input)
+    try:
+        with open(path, "wb") as out:
+            n_rows, dropped = pack_rows(stream, args.input_format or detect_format(args.input), out, args.label_field)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    log(f"packed {n_rows} labeled rows ({dropped} without a usable label) in {time.perf_counter() - started:.1f} s")
+    return path, not args.rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sss.fit_weights", description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("train", "fit a weight table"), ("report", "held-out accuracy of weight tables")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("input", help="labeled JSONL or CSV answer file ('-' for stdin)")
+        p.add_argument("--input-format", choices=["jsonl", "csv"])
+        p.add_argument("--label-field", default="label")
+        p.add_argument("--rows", help="packed row file to reuse, or to keep (default: a temporary file)")
+        p.add_argument("--holdout", type=float, default=0.1, help="share of rows held out (default 0.1)")
+    train = sub.choices["train"]
+    train.add_argument("-o", "--output", required=True, help="weight table JSON to write")
+    train.add_argument("--epochs", type=int, default=3)
+    train.add_argument("--batch-size", type=int, default=8192)
+    train.add_argument("--lr", type=float, default=0.02)
+    train.add_argument("--l2", type=float, default=1e-6)
+    sub.choices["report"].add_argument("--weights", action="append", default=[], help="weight table to compare (repeatable)")
+    synth = sub.add_parser("synthetic", help="write a labeled dataset for trying the pipeline")
+    synth.add_argument("-n", type=int, default=1000000)
+    synth.add_argument("-o", "--output", required=True)
+    synth.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    if args.command == "synthetic":
+        write_synthetic(args.output, args.n, args.seed)
+        log(f"wrote {args.n} labeled rows to {args.output}")
+        return 0
+
+    path, temporary = _packed(args, log)
+    rows = None
+    try:
+        rows = open_rows(path)
+        tables = {"built-in": BUILT_IN_WEIGHTS}
+        if args.command == "train":
+            started = time.perf_counter()
+            params = fit(rows, args.epochs, args.batch_size, args.lr, args.l2, args.holdout, log=log)
+            tables["fitted"] = to_weight_table(params)
+            report = evaluate(rows, tables, args.holdout)
+            trained = {"source": os.path.basename(str(args.input)), "rows": len(rows), "holdout": args.holdout,
+                       "epochs": args.epochs, "seconds": round(time.perf_counter() - started, 1)}
+            save_weights(tables["fitted"], args.output, report["fitted"], trained)
+            log(f"wrote weight table to {args.output} (weights_digest {weights_digest(tables['fitted'])[:12]})")
+        else:
+            for weights_path in args.weights:
+                tables[os.path.basename(weights_path)] = load_weights(weights_path)
+            report = evaluate(rows, tables, args.holdout)
+        print(format_report(report))
+    finally:
+        if temporary:
+            # Drop the memory map before removing its file
+            rows = None
+            os.remove(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,382 @@
+"""Local food catalog: classify a food by name instead of answering the quiz.
+
+Each catalog entry is a food name, a popularity count and the answers a typical
+serving of that food gives to ``QUIZ_QUESTIONS``.  Catalogs are ordinary
+answer-set files (see ``sss.answer_files``) with ``name`` and ``popularity``
+fields; the app loads ``SSS_FOOD_CATALOG``, by default the seed catalog
+``foods.jsonl`` next to this module.
+
+Search is built for type-ahead over 100k+ entries:
+
+* prefix search bisects a sorted array of keys (every name, plus every suffix
+  of a name that starts at a word, so "sal" finds "caesar salad").  Ranges of
+  keys too wide to rank per keystroke ("s", "salad") get their most popular
+  entries precomputed when the catalog is loaded, so no query scans more than
+  ``SCAN_LIMIT`` keys;
+* when prefixes find too little, each typed word is corrected against the
+  catalog's vocabulary and the corrected phrases, fewest typos (edits, or
+  swapped neighbours) first, go through the same prefix search, so "ceasar
+  salda" finds "caesar salad" and "ceasar" does not find "cereal".  A trigram
+  index over the distinct words, filtered by length, by how many trigrams the
+  allowed typos can break and by the letters a word lacks, leaves a handful of
+  words to measure per typed word; the last word only has to match the start
+  of a vocabulary word.
+
+Queries with no letters or digits ("!!!") match nothing.
+
+A matched food is scored and explained with ``QuizRecord`` like any finished
+quiz; results are memoized per answer vector, and the most popular foods are
+classified up front.
+
+Usage::
+
+    python -m sss.food_catalog search ramen
+    python -m sss.food_catalog bench --synthetic 100000
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from sss.answer_files import detect_format, open_input, read_chunks
+from sss.quiz_state import QuizRecord
+
+DEFAULT_PATH = os.environ.get("SSS_FOOD_CATALOG") or str(Path(__file__).resolve().parent / "foods.jsonl")
+
+# Prefix ranges wider than this get precomputed top matches
+SCAN_LIMIT = 256
+# Precomputed matches kept per wide prefix
+TOP_K = 16
+# Vocabulary words measured per typed word (most shared trigrams first)
+FUZZY_SHORTLIST = 32
+# Corrections kept per typed word, and corrected phrases searched per query
+FUZZY_WORDS = 3
+FUZZY_PHRASES = 8
+# Foods classified while the catalog loads
+WARM_FOODS = 256
+
+_END = "\U0010ffff"
+
+Food = namedtuple("Food", "id name popularity answers")
+FoodResult = namedtuple("FoodResult", "food pcts explanation")
+
+
+def normalize(text):
+    """Lowercase, accents stripped, runs of anything but letters and digits as one space."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join("".join(c if c.isalnum() else " " for c in text).split())
+
+
+def trigrams(text, pad_end=True):
+    """Trigrams of a normalized name; queries are not padded at the end (the word may go on)."""
+    padded = f"  {text} " if pad_end else f"  {text}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _letter(c):
+    # Column of a letter in the vocabulary's letter table: a-z, then every other letter
+    return ord(c) - 97 if "a" <= c <= "z" else 26
+
+
+def max_typos(word):
+    """Typos tolerated in one typed word: none below 3 characters, two from 8."""
+    return 0 if len(word) < 3 else 1 if len(word) < 8 else 2
+
+
+def typo_distance(query, word, limit, prefix=False):
+    """Fewest edits (insert, delete, substitute, swap two neighbours) turning ``query`` into
+    ``word``, or with ``prefix`` into the beginning of it; ``limit + 1`` for anything over ``limit``."""
+    over = limit + 1
+    n = len(query)
+    if prefix:
+        word = word[:n + limit]
+    elif abs(n - len(word)) > limit:
+        return over
+    m = len(word)
+    # Optimal string alignment, only within `limit` of the diagonal (anything further is over)
+    before, prev = None, [j if j < over else over for j in range(m + 1)]
+    for i in range(1, n + 1):
+        q = query[i - 1]
+        row = [over] * (m + 1)
+        row[0] = i if i < over else over
+        best = row[0]
+        for j in range(max(1, i - limit), min(m, i + limit) + 1):
+            cost = prev[j - 1] if q == word[j - 1] else prev[j - 1] + 1
+            if prev[j] < cost:
+                cost = prev[j] + 1
+            if row[j - 1] < cost:
+                cost = row[j - 1] + 1
+            if j > 1 and i > 1 and q == word[j - 2] and query[i - 2] == word[j - 1] and before[j - 2] < cost:
+                cost = before[j - 2] + 1
+            if cost > over:
+                cost = over
+            row[j] = cost
+            if cost < best:
+                best = cost
+        if best == over and min(prev) == over:
+            return over
+        before, prev = prev, row
+    return min(prev) if prefix else prev[m]
+
+
+@lru_cache(maxsize=4096)
+def classify_answers(answers):
+    """Percentages and explanation for one answer vector (memoized: popular foods repeat)."""
+    record = QuizRecord.from_answers(answers)
+    return record.pcts(), record.explain()
+
+
+class FoodCatalog:
+    """Names, popularity and answer vectors, with the prefix and trigram indexes."""
+
+    def __init__(self, names, popularity, answers, warm=WARM_FOODS):
+        self.names = list(names)
+        self.popularity = np.asarray(popularity, dtype=np.int64)
+        self.answers = np.asarray(answers, dtype=np.int8)
+        self._normalized = [normalize(n) for n in self.names]
+        self._by_name = {}
+        for f_idx, name in enumerate(self._normalized):
+            if name not in self._by_name or self.popularity[f_idx] > self.popularity[self._by_name[name]]:
+                self._by_name[name] = f_idx
+        self._build_prefix_index()
+        self._build_word_index()
+        for f_idx in self.top(warm):
+            self.classify(f_idx)
+
+    def __len__(self):
+        return len(self.names)
+
+    def food(self, f_idx):
+        return Food(f_idx, self.names[f_idx], int(self.popularity[f_idx]), tuple(self.answers[f_idx].tolist()))
+
+    def top(self, n):
+        """Indices of the n most popular foods."""
+        return np.argsort(-self.popularity, kind="stable")[:n].tolist()
+
+    def classify(self, f_idx):
+        pcts, explanation = classify_answers(tuple(self.answers[f_idx].tolist()))
+        return FoodResult(self.food(f_idx), pcts, explanation)
+
+    def lookup(self, name):
+        """The food with exactly this (normalized) name, or None."""
+        f_idx = self._by_name.get(normalize(name))
+        return None if f_idx is None else self.food(f_idx)
+
+    def search(self, query, limit=8):
+        """Best matches for what has been typed so far: exact name, prefix matches, then fuzzy ones."""
+        q = normalize(query)
+        if not q:
+            return []
+        found = self._prefix_matches(q, limit)
+        exact = self._by_name.get(q)
+        if exact is not None:
+            found = [exact] + [f_idx for f_idx in found if f_idx != exact][:limit - 1]
+        if len(found) < limit and len(q) >= 3:
+            seen = set(found)
+            found += [f_idx for f_idx in self._fuzzy_matches(q, limit + len(found)) if f_idx not in seen][:limit - len(found)]
+        return [self.food(f_idx) for f_idx in found]
+
+    # Prefix index ---------------------------------------------------------
+
+    def _build_prefix_index(self):
+        keys = []
+        for f_idx, name in enumerate(self._normalized):
+            words = name.split(" ")
+            for w_idx in range(len(words)):
+                keys.append((" ".join(words[w_idx:]), f_idx))
+        keys.sort()
+        self._keys = [k for k, _ in keys]
+        self._key_foods = np.array([f for _, f in keys], dtype=np.int32)
+        self._key_popularity = self.popularity[self._key_foods] if len(keys) else np.zeros(0, dtype=np.int64)
+        self._wide = {}
+        self._precompute(0, len(self._keys), "")
+
+    def _ranked(self, lo, hi, limit):
+        """Distinct foods of keys[lo:hi], most popular first."""
+        pops = self._key_popularity[lo:hi]
+        # A food can appear under several keys of the range; take enough to fill `limit` after dedup
+        take = min(len(pops), 4 * limit)
+        picks = np.argpartition(-pops, take - 1)[:take] if take < len(pops) else np.arange(len(pops))
+        picks = picks[np.lexsort((self._key_foods[lo + picks], -pops[picks]))]
+        return list(dict.fromkeys(self._key_foods[lo + picks].tolist()))[:limit]
+
+    def _precompute(self, lo, hi, prefix):
+        # Walk the sorted keys one character at a time, only into ranges still too wide to scan
+        if hi - lo <= SCAN_LIMIT:
+            return
+        self._wide[prefix] = self._ranked(lo, hi, TOP_K)
+        depth = len(prefix)
+        i = lo
+        if i < hi and len(self._keys[i]) == depth:
+            i = bisect_right(self._keys, prefix, i, hi)
+        while i < hi:
+            child = prefix + self._keys[i][depth]
+            j = bisect_right(self._keys, child + _END, i, hi)
+            self._precompute(i, j, child)
+            i = j
+
+    def _prefix_matches(self, q, limit):
+        lo = bisect_left(self._keys, q)
+        hi = bisect_right(self._keys, q + _END, lo)
+        if hi - lo > SCAN_LIMIT:
+            return self._wide[q][:limit]
+        return self._ranked(lo, hi, limit) if hi > lo else []
+
+    # Word index -----------------------------------------------------------
+
+    def _build_word_index(self):
+        # Distinct words with a letter and no digit (numbers are not typo-corrected), and the
+        # summed popularity of the foods using each, to order equally close corrections
+        weights = {}
+        for f_idx, name in enumerate(self._normalized):
+            for word in set(name.split(" ")):
+                if word.isalpha():
+                    weights[word] = weights.get(word, 0) + int(self.popularity[f_idx])
+        self._words = sorted(weights)
+        self._word_weights = np.array([weights[w] for w in self._words], dtype=np.int64)
+        self._word_lengths = np.array([len(w) for w in self._words], dtype=np.int32)
+        self._word_letters = np.zeros((len(self._words), 27), dtype=bool)
+        for w_idx, word in enumerate(self._words):
+            self._word_letters[w_idx, [_letter(c) for c in word]] = True
+        postings = {}
+        for w_idx, word in enumerate(self._words):
+            for gram in trigrams(word):
+                postings.setdefault(gram, []).append(w_idx)
+        self._word_postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def _corrections(self, typed, prefix):
+        """Up to ``FUZZY_WORDS`` (typos, word) pairs for one typed word, the word as typed first."""
+        found = [(0, typed)]
+        allowed = max_typos(typed)
+        if not allowed or not typed.isalpha():
+            return found
+        grams = trigrams(typed, pad_end=not prefix)
+        used = [self._word_postings[g] for g in grams if g in self._word_postings]
+        if not used:
+            return found
+        shared = np.bincount(np.concatenate(used), minlength=len(self._words))
+        # One typo breaks at most four of the typed word's trigrams (a swap; an edit breaks three)
+        lengths = self._word_lengths
+        fits = (lengths >= len(typed) - allowed) if prefix else (np.abs(lengths - len(typed)) <= allowed)
+        fits &= shared >= max(1, len(grams) - 4 * allowed)
+        # Every letter of the typed word the vocabulary word lacks costs at least one typo
+        fits &= (~self._word_letters[:, sorted({_letter(c) for c in typed})]).sum(axis=1) <= allowed
+        candidates = np.flatnonzero(fits)
+        if len(candidates) > FUZZY_SHORTLIST:
+            candidates = candidates[np.argpartition(-shared[candidates], FUZZY_SHORTLIST - 1)[:FUZZY_SHORTLIST]]
+        close = []
+        for w_idx in candidates.tolist():
+            typos = typo_distance(typed, self._words[w_idx], allowed, prefix)
+            if 0 < typos <= allowed:
+                close.append((typos, -self._word_weights[w_idx], self._words[w_idx]))
+        # Fewest typos first, then the word more popular foods use
+        found += [(typos, word) for typos, _, word in sorted(close)[:FUZZY_WORDS - 1]]
+        return found
+
+    def _fuzzy_matches(self, q, limit):
+        typed = q.split(" ")
+        options = [self._corrections(word, prefix=w_idx == len(typed) - 1) for w_idx, word in enumerate(typed)]
+        # Corrected phrases by total typos (product order breaks ties); the phrase as typed was
+        # already searched
+        phrases = sorted(itertools.product(*options), key=lambda combo: sum(t for t, _ in combo))[1:]
+        found = []
+        for combo in phrases[:FUZZY_PHRASES]:
+            phrase = " ".join(word for _, word in combo)
+            found += [f_idx for f_idx in self._prefix_matches(phrase, limit) if f_idx not in found]
+            if len(found) >= limit:
+                break
+        return found[:limit]
+
+
+def load_catalog(path=DEFAULT_PATH, warm=WARM_FOODS):
+    """Catalog from an answer-set file whose records carry ``name`` and ``popularity``."""
+    names, popularity, answers = [], [], []
+    stream = open_input(path)
+    try:
+        for fields, chunk in read_chunks(stream, detect_format(path)):
+            names += [str(f["name"]) for f in fields]
+            popularity += [int(f.get("popularity") or 0) for f in fields]
+            answers.append(chunk)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return FoodCatalog(names, popularity, np.concatenate(answers) if answers else np.zeros((0, 10)), warm)
+
+
+_STYLES = ("spicy", "vegan", "smoked", "grilled", "classic", "crispy", "creamy", "loaded", "mini", "chilled",
+           "homestyle", "street", "deluxe", "garlic", "lemon", "honey", "truffle", "korean", "thai", "mexican",
+           "italian", "greek", "cajun", "texas", "new york", "sicilian", "tuscan", "nordic", "breakfast", "late night")
+
+
+def synthetic_catalog(n, base=None, seed=0, warm=WARM_FOODS):
+    """n variations on the seed foods ("smoked tuscan ramen #12", ...), for load testing the indexes."""
+    base = load_catalog(warm=0) if base is None else base
+    rng = random.Random(seed)
+    names, popularity, rows = [], [], []
+    for i in range(n):
+        f_idx = rng.randrange(len(base))
+        names.append(f"{rng.choice(_STYLES)} {rng.choice(_STYLES)} {base.names[f_idx]} {i}")
+        popularity.append(int(rng.paretovariate(1.2) * 10))
+        rows.append(base.answers[f_idx])
+    return FoodCatalog(names, popularity, np.array(rows), warm)
+
+
+def bench_search(catalog, queries, repeat=5):
+    """Median and p99 microseconds per ``search`` call, over every prefix of every query."""
+    typed = [q[:i] for q in queries for i in range(1, len(q) + 1)]
+    times = []
+    for _ in range(repeat):
+        for q in typed:
+            started = time.perf_counter()
+            catalog.search(q)
+            times.append(time.perf_counter() - started)
+    q = statistics.quantiles(times, n=100, method="inclusive")
+    return {"searches": len(times), "median_us": statistics.median(times) * 1e6, "p99_us": q[98] * 1e6,
+            "max_us": max(times) * 1e6}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sss.food_catalog",
+                                     description="Search the food catalog or time its indexes.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    search = sub.add_parser("search", help="show matches and their classification")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=8)
+    bench = sub.add_parser("bench", help="time type-ahead searches")
+    bench.add_argument("--synthetic", type=int, default=0, help="time a generated catalog of this many foods")
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    args = parser.parse_args(argv)
+
+    catalog = load_catalog(args.path)
+    if args.command == "search":
+        for food in catalog.search(args.query, args.limit):
+            result = catalog.classify(food.id)
+            print(f"{food.name:<40}{result.explanation.winner:<10}{max(result.pcts):5.1f}%")
+        return 0
+
+    if args.synthetic:
+        started = time.perf_counter()
+        catalog = synthetic_catalog(args.synthetic, catalog)
+        print(f"built {len(catalog)} foods in {time.perf_counter() - started:.2f} s")
+    queries = ["caesar salad", "ramen", "pizza", "chicken noodle soup", "ceasar salda", "grilld chese",
+               "spicy korean", "s", "soup", "sandwich"]
+    result = bench_search(catalog, queries)
+    print(f"{result['searches']} searches: median {result['median_us']:.0f} us, "
+          f"p99 {result['p99_us']:.0f} us, max {result['max_us']:.0f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Import-time report for the app's cold start, in ``-X importtime`` style.
+
+Runs a fresh interpreter with ``-X importtime`` several times (by default
+executing ``streamlit_app.py`` in Streamlit's bare mode, which performs every
+import a first request triggers), takes the per-module median and prints the
+heaviest top-level imports.  Reports can be saved and compared against a
+baseline to catch regressions.
+
+Usage::
+
+    python -m sss.importtime --json importtime.json
+    python -m sss.importtime --baseline importtime.json --threshold 0.2
+    python -m sss.importtime -m sss.scoring -m sss.charts
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+APP_SCRIPT = Path(__file__).resolve().parent.parent / "streamlit_app.py"
+
+# Modules smaller than this are ignored when flagging per-module regressions
+MIN_MODULE_REGRESSION_MS = 5.0
+# Interpreter start-up imports that the app has no say over
+STARTUP_MODULES = {"site"}
+
+
+def parse_importtime(stderr):
+    """Parse ``-X importtime`` output into ``[(name, depth, self_us, cumulative_us)]``."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def measure_once(modules=None, script=APP_SCRIPT, env=None):
+    if modules:
+        cmd = [sys.executable, "-X", "importtime", "-c", "; ".join(f"import {m}" for m in modules)]
+    else:
+        cmd = [sys.executable, "-X", "importtime", str(script)]
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=Path(script).parent,
+                          env={**os.environ, **(env or {})})
+    entries = parse_importtime(proc.stderr)
+    if proc.returncode != 0 or not entries:
+        raise RuntimeError(f"measurement run failed ({proc.returncode}):\n{proc.stderr[-2000:]}")
+    return entries
+
+
+def measure(runs=5, **kwargs):
+    """Median report over ``runs`` fresh interpreters.
+
+    Returns ``{"total_ms", "top_level": {name: cumulative_ms}, "self": {name: self_ms}}``
+    where ``top_level`` holds only the imports made directly by the target.
+    """
+    totals, top_level, self_times = [], {}, {}
+    for _ in range(runs):
+        entries = measure_once(**kwargs)
+        totals.append(sum(cum for _, depth, _, cum in entries if depth == 0) / 1000)
+        for name, depth, self_us, cum_us in entries:
+            self_times.setdefault(name, []).append(self_us / 1000)
+            if depth == 0:
+                top_level.setdefault(name, []).append(cum_us / 1000)
+    return {
+        "runs": runs,
+        "total_ms": round(statistics.median(totals), 2),
+        "top_level": {k: round(statistics.median(v), 2) for k, v in top_level.items()},
+        "self": {k: round(statistics.median(v), 2) for k, v in self_times.items()},
+    }
+
+
+def compare(report, baseline, threshold):
+    """Human-readable regressions of ``report`` against ``baseline`` (empty if none)."""
+    problems = []
+    limit = baseline["total_ms"] * (1 + threshold)
+    if report["total_ms"] > limit:
+        problems.append(f"total import time {report['total_ms']:.1f} ms > {limit:.1f} ms "
+                        f"(baseline {baseline['total_ms']:.1f} ms + {threshold:.0%})")
+    for name, ms in report["top_level"].items():
+        if name in STARTUP_MODULES:
+            continue
+        before = baseline["top_level"].get(name, 0.0)
+        if ms - before > MIN_MODULE_REGRESSION_MS and ms > before * (1 + threshold):
+            problems.append(f"{name}: {ms:.1f} ms (baseline {before:.1f} ms)")
+    return problems
+
+
+def format_report(report, top=15):
+    lines = [f"total import time: {report['total_ms']:.1f} ms (median of {report['runs']} runs)", "",
+             f"{'cumulative ms':>14}  top-level import"]
+    for name, ms in sorted(report["top_level"].items(), key=lambda kv: -kv[1])[:top]:
+        lines.append(f"{ms:>14.1f}  {name}")
+    lines += ["", f"{'self ms':>14}  module"]
+    for name, ms in sorted(report["self"].items(), key=lambda kv: -kv[1])[:top]:
+        lines.append(f"{ms:>14.1f}  {name}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sss.importtime", description=__doc__.split("\n\n")[0])
+    parser.add_argument("-m", "--module", action="append", dest="modules",
+                        help="measure importing this module instead of running the app (repeatable)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--chart-backend", choices=["plotly", "svg"],
+                        help="SSS_CHART_BACKEND for the measured app run")
+    parser.add_argument("--json", help="write the report here")
+    parser.add_argument("--baseline", help="report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown (default 0.2)")
+    args = parser.parse_args(argv)
+
+    env = {"SSS_CHART_BACKEND": args.chart_backend} if args.chart_backend else None
+    report = measure(runs=args.runs, modules=args.modules, env=env)
+    print(format_report(report, top=args.top))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=1), encoding="utf-8")
+
+    if args.baseline:
+        problems = compare(report, json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.threshold)
+        print()
+        if problems:
+            print("import-time regressions:\n  " + "\n  ".join(problems))
+            return 1
+        print(f"no import-time regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""Concurrent-session load generator for the quiz app.
+
+Starts the app locally (or targets ``--url``), then for each user count in
+``--users`` runs that many simulated quiz takers at once for ``--duration``
+seconds.  Every simulated user is a ``SessionClient`` (one browser tab) that
+loops through the quiz: Start, one click per question (Skip with probability
+``--skip-rate``, otherwise Next with a random option, or the answers of a
+replayed answer file), then Classify Another Food.
+
+Per step it reports p50 / p95 / p99 latency per interaction type, completed
+script runs per second, and the server process's CPU use and peak RSS (read
+from ``/proc``), so the point where latency falls apart is easy to spot.
+
+Usage::
+
+    python -m sss.loadgen --users 1,5,10,25,50 --duration 20
+    python -m sss.loadgen --users 10 --replay answers.jsonl --skip-rate 0 --json load.json
+    python -m sss.loadgen --url http://localhost:8501 --pid 1234 --users 20
+
+The load generator runs in a single asyncio process next to the server; on
+small machines it competes with the server for CPU, so compare steps against
+each other rather than reading the numbers as absolute capacity.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+from sss.answer_files import detect_format, open_input, read_chunks
+from sss.quiz_bank import QUIZ_QUESTIONS
+from sss.scoring import SKIP
+from sss.session_client import APP_SCRIPT, SessionClient, serve_app
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def cpu_seconds(pid):
+    """User + system CPU seconds used so far by process ``pid``."""
+    with open(f"/proc/{pid}/stat") as f:
+        # Fields after the parenthesized command name; utime and stime are 14 and 15
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+
+
+def rss_bytes(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def load_paths(path):
+    """Answer vectors (option index or ``SKIP`` per question) from a JSONL / CSV answer file."""
+    stream = open_input(path)
+    try:
+        return [row for _fields, chunk in read_chunks(stream, detect_format(path), errors="skip")
+                for row in chunk.tolist()]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def percentiles(values):
+    """p50 / p95 / p99 in milliseconds."""
+    if len(values) < 2:
+        ms = values[0] * 1000 if values else 0.0
+        return {"p50": ms, "p95": ms, "p99": ms}
+    q = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50": q[49] * 1000, "p95": q[94] * 1000, "p99": q[98] * 1000}
+
+
+class Step:
+    """Everything measured while one user count was running."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.script_runs = 0
+        self.quizzes = 0
+        self.errors = 0
+
+    def add(self, interaction):
+        self.latencies.setdefault(interaction.name, []).append(interaction.latency)
+        self.script_runs += interaction.script_runs
+
+
+async def simulate_user(url, step, deadline, rng, paths=None, skip_rate=0.1, think=0.0, mode="server"):
+    """Take quizzes back to back until ``deadline``; results go into ``step``."""
+    query = "mode=client" if mode == "client" else ""
+    async with SessionClient(url, query) as client:
+        step.add(await client.load())
+        while time.monotonic() < deadline:
+            path = list(rng.choice(paths)) if paths else [
+                SKIP if rng.random() < skip_rate else rng.randrange(len(q["options"])) for q in QUIZ_QUESTIONS
+            ]
+            if mode == "client":
+                quiz = client.find("component_instance")
+                # All questions are answered in the browser before the one submission
+                await asyncio.sleep(think * len(path) * rng.random() * 2)
+                step.add(await client.submit(quiz, {"answers": [None if o == SKIP else o for o in path]}, "submit"))
+            else:
+                step.add(await client.click(client.find("button", "Start Classification"), "start"))
+                for o_idx in path:
+                    radio = client.find("radio")
+                    if radio is None:
+                        break
+                    await asyncio.sleep(think * rng.random() * 2)
+                    if o_idx == SKIP:
+                        step.add(await client.click(client.find("button", "Skip"), "skip"))
+                    else:
+                        client.set_value(radio, radio.proto.options[o_idx % len(radio.proto.options)])
+                        step.add(await client.click(client.find("button", "Next"), "next"))
+            step.add(await client.click(client.find("button", "Classify Another Food"), "reset"))
+            step.quizzes += 1
+
+
+async def _guarded(coro, step):
+    try:
+        await coro
+    except (OSError, asyncio.TimeoutError, AttributeError) as e:
+        # A dropped connection or a page that didn't render as expected
+        step.errors += 1
+        print(f"simulated user failed: {e!r}", file=sys.stderr)
+
+
+async def run_step(url, users, duration, pid=None, seed=0, **user_kwargs):
+    """Run ``users`` simulated users for ``duration`` seconds; returns the step report."""
+    step = Step()
+    peak_rss = 0
+    cpu_before = cpu_seconds(pid) if pid else None
+    started = time.monotonic()
+    deadline = started + duration
+    tasks = [
+        asyncio.create_task(_guarded(
+            simulate_user(url, step, deadline, random.Random(seed * 1000003 + i), **user_kwargs), step))
+        for i in range(users)
+    ]
+    while not all(t.done() for t in tasks):
+        if pid:
+            peak_rss = max(peak_rss, rss_bytes(pid))
+        await asyncio.sleep(0.5)
+    elapsed = time.monotonic() - started
+
+    everything = [lat for lats in step.latencies.values() for lat in lats]
+    report = {
+        "users": users,
+        "seconds": round(elapsed, 2),
+        "quizzes": step.quizzes,
+        "interactions": len(everything),
+        "errors": step.errors,
+        "reruns_per_s": round(step.script_runs / elapsed, 2),
+        "latency_ms": {k: round(v, 1) for k, v in percentiles(everything).items()},
+        "by_interaction": {
+            name: {"count": len(lats), **{k: round(v, 1) for k, v in percentiles(lats).items()}}
+            for name, lats in step.latencies.items()
+        },
+    }
+    if pid:
+        report["cpu_pct"] = round((cpu_seconds(pid) - cpu_before) / elapsed * 100, 1)
+        report["peak_rss_mib"] = round(peak_rss / 2**20, 1)
+    return report
+
+
+def format_step(report):
+    lat = report["latency_ms"]
+    line = (f"{report['users']:>6}{report['interactions']:>9}{report['reruns_per_s']:>10.1f}"
+            f"{lat['p50']:>9.1f}{lat['p95']:>9.1f}{lat['p99']:>9.1f}")
+    if "cpu_pct" in report:
+        line += f"{report['cpu_pct']:>8.1f}{report['peak_rss_mib']:>9.1f}"
+    return line + (f"  ({report['errors']} errors)" if report["errors"] else "")
+
+
+HEADER = (f"{'users':>6}{'clicks':>9}{'reruns/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'cpu %':>8}{'rss MiB':>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sss.loadgen", description=__doc__.split("\n\n")[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="load an already running app")
+    target.add_argument("--script", default=APP_SCRIPT, help="app script to start (default: this checkout)")
+    parser.add_argument("--pid", type=int, help="server process to watch for CPU / RSS with --url")
+    parser.add_argument("--users", default="1,5,10,25", help="comma-separated concurrent user counts")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per user count")
+    parser.add_argument("--skip-rate", type=float, default=0.1, help="probability of skipping a question")
+    parser.add_argument("--replay", help="JSONL / CSV answer file to draw answer paths from")
+    parser.add_argument("--think", type=float, default=0.0, help="mean seconds between a user's clicks")
+    parser.add_argument("--mode", choices=["server", "client"], default="server", help="quiz mode to drive")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write all step reports here")
+    args = parser.parse_args(argv)
+
+    user_counts = [int(n) for n in args.users.split(",")]
+    user_kwargs = {"paths": load_paths(args.replay) if args.replay else None, "skip_rate": args.skip_rate,
+                   "think": args.think, "mode": args.mode}
+
+    def run_all(url, pid):
+        reports = []
+        print(HEADER)
+        for users in user_counts:
+            report = asyncio.run(run_step(url, users, args.duration, pid, args.seed, **user_kwargs))
+            print(format_step(report), flush=True)
+            reports.append(report)
+        return reports
+
+    if args.url:
+        reports = run_all(args.url, args.pid)
+    else:
+        # Keep the server's own results store out of load tests
+        with serve_app(args.script, env={"SSS_RESULTS_DB": ""}) as (url, proc):
+            reports = run_all(url, proc.pid)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
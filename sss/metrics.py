@@ -0,0 +1,362 @@
+"""Per-rerun phase timings, a Prometheus export surface and a sampling profiler.
+
+The app wraps each phase of a rerun (CSS and title injection, scoring, chart
+build, ``st.plotly_chart``, the breakdown table, the explanation builders...)
+in ``phase(name)``.  While metrics are off, ``phase`` hands back one shared
+do-nothing context manager, so an instrumented rerun costs a few hundred
+nanoseconds more than an uninstrumented one.  While they are on, every phase
+feeds a histogram with cumulative buckets (for Prometheus) and a rolling
+window of recent buckets (for the p50 / p95 / p99 of the last minute).
+
+Metrics are turned on by the environment of the server process (the app
+calls ``start_from_env`` on its first page load):
+
+* ``SSS_METRICS_PORT``: serve ``/metrics`` (Prometheus text format) on
+  127.0.0.1 at that port, plus the profiler endpoints below;
+* ``SSS_METRICS_FILE``: rewrite that file in Prometheus text format every
+  ``SSS_METRICS_INTERVAL`` seconds (default 10), e.g. for node_exporter's
+  textfile collector;
+* ``SSS_PROFILE``: start the sampling profiler with the server (its stacks
+  are served at ``/profile`` and written next to ``SSS_METRICS_FILE``).
+
+The profiler samples the stacks of Streamlit's script threads every few
+milliseconds and aggregates them in collapsed ("folded") format, ready for
+flamegraph.pl or speedscope.  It can be switched on and off at runtime::
+
+    curl -X POST 'localhost:9464/profile/start?interval=0.005'
+    curl localhost:9464/profile > reruns.folded
+    curl -X POST localhost:9464/profile/stop
+"""
+
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+# Upper bounds in seconds; one more bucket catches everything slower
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Rolling window: WINDOW_SLOTS slots of SLOT_SECONDS each
+SLOT_SECONDS = 10
+WINDOW_SLOTS = 6
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def bucket_quantile(counts, q):
+    """Upper bound of the bucket holding quantile ``q`` (inf past the last bound, None if empty)."""
+    n = sum(counts)
+    if not n:
+        return None
+    rank, seen = q * n, 0
+    for bound, count in zip(BUCKETS, counts):
+        seen += count
+        if seen >= rank:
+            return bound
+    return float("inf")
+
+
+class Histogram:
+    """Cumulative bucket counts plus a rolling window of the recent ones."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.n = 0
+        self._slots = [[0] * (len(BUCKETS) + 1) for _ in range(WINDOW_SLOTS)]
+        self._slot_epochs = [-1] * WINDOW_SLOTS
+
+    def observe(self, seconds, now=None):
+        bucket = bisect_left(BUCKETS, seconds)
+        self.counts[bucket] += 1
+        self.total += seconds
+        self.n += 1
+        epoch = int((time.monotonic() if now is None else now) // SLOT_SECONDS)
+        slot = epoch % WINDOW_SLOTS
+        if self._slot_epochs[slot] != epoch:
+            # The slot last held a window that has rolled out; start it over
+            self._slots[slot] = [0] * (len(BUCKETS) + 1)
+            self._slot_epochs[slot] = epoch
+        self._slots[slot][bucket] += 1
+
+    def recent(self, now=None):
+        """Bucket counts over the rolling window."""
+        epoch = int((time.monotonic() if now is None else now) // SLOT_SECONDS)
+        counts = [0] * (len(BUCKETS) + 1)
+        for slot_epoch, slot in zip(self._slot_epochs, self._slots):
+            if epoch - slot_epoch < WINDOW_SLOTS:
+                counts = [a + b for a, b in zip(counts, slot)]
+        return counts
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("registry", "name", "started")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class Registry:
+    """Phase histograms and stats collectors of one process."""
+
+    def __init__(self):
+        self.enabled = False
+        self._histograms = {}
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def phase(self, name):
+        """Context manager timing one phase (a shared no-op while disabled)."""
+        return _Phase(self, name) if self.enabled else _NULL_PHASE
+
+    def clock(self):
+        """Start time for ``observe_since``, or None while disabled."""
+        return time.perf_counter() if self.enabled else None
+
+    def observe_since(self, name, started):
+        if started is not None:
+            self.observe(name, time.perf_counter() - started)
+
+    def observe(self, name, seconds):
+        # Sessions rerun in their own threads
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def register_collector(self, name, stats, counters=()):
+        """Export the numeric values of ``stats()`` (a dict) as ``sss_<name>_<key>`` gauges.
+
+        Keys listed in ``counters`` only ever grow (hits, misses, rows
+        written...) and are exported as ``sss_<name>_<key>_total`` counters,
+        so ``rate()`` works on them.
+        """
+        self._collectors[name] = (stats, frozenset(counters))
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def prometheus_text(self):
+        """Everything in Prometheus text exposition format."""
+        with self._lock:
+            snapshot = {name: (list(h.counts), h.total, h.n, h.recent()) for name, h in self._histograms.items()}
+        lines = [
+            "# HELP sss_phase_seconds Time spent in each phase of a rerun.",
+            "# TYPE sss_phase_seconds histogram",
+        ]
+        for name, (counts, total, n, _recent) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'sss_phase_seconds_bucket{{phase="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'sss_phase_seconds_sum{{phase="{name}"}} {total:.9f}')
+            lines.append(f'sss_phase_seconds_count{{phase="{name}"}} {n}')
+        lines += [
+            f"# HELP sss_phase_recent_seconds Phase time quantiles over the last {SLOT_SECONDS * WINDOW_SLOTS} s "
+            "(bucket upper bounds).",
+            "# TYPE sss_phase_recent_seconds gauge",
+        ]
+        for name, (_counts, _total, _n, recent) in sorted(snapshot.items()):
+            for q in QUANTILES:
+                value = bucket_quantile(recent, q)
+                if value is not None:
+                    lines.append(f'sss_phase_recent_seconds{{phase="{name}",quantile="{q}"}} {value}')
+        for prefix, (stats, counters) in self._collectors.items():
+            try:
+                values = stats()
+            except Exception as e:  # a broken collector must not take /metrics down
+                print(f"metrics: collector {prefix} failed: {e!r}", file=sys.stderr)
+                continue
+            for key, value in values.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    if key in counters:
+                        lines.append(f"# TYPE sss_{prefix}_{key}_total counter")
+                        lines.append(f"sss_{prefix}_{key}_total {value}")
+                    else:
+                        lines.append(f"# TYPE sss_{prefix}_{key} gauge")
+                        lines.append(f"sss_{prefix}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+phase = registry.phase
+clock = registry.clock
+observe_since = registry.observe_since
+
+
+# Sampling profiler --------------------------------------------------------
+
+class SamplingProfiler:
+    """Samples the stacks of matching threads and counts them in folded format."""
+
+    def __init__(self, interval=0.005, thread_prefix="ScriptRunner"):
+        self.interval = interval
+        self.thread_prefix = thread_prefix
+        self.samples = 0
+        self._stacks = Counter()
+        # The sampler thread counts while HTTP handler threads read and clear
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sss-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self.running:
+            self._stop.set()
+            self._thread.join()
+
+    def clear(self):
+        with self._lock:
+            self._stacks = Counter()
+            self.samples = 0
+
+    def folded(self):
+        """``frame;frame;... count`` lines, outermost frame first."""
+        with self._lock:
+            stacks = self._stacks.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            sampled = []
+            for ident, frame in sys._current_frames().items():
+                if not names.get(ident, "").startswith(self.thread_prefix):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                    frame = frame.f_back
+                sampled.append(";".join(reversed(stack)))
+            with self._lock:
+                self._stacks.update(sampled)
+                self.samples += len(sampled)
+
+
+profiler = SamplingProfiler()
+
+
+# Export surfaces ----------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/metrics":
+            self._reply(registry.prometheus_text(), "text/plain; version=0.0.4")
+        elif path == "/profile":
+            self._reply(profiler.folded())
+        else:
+            self._reply("not found\n", status=404)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path == "/profile/start":
+            interval = parse_qs(url.query).get("interval")
+            if interval:
+                try:
+                    seconds = float(interval[0])
+                except ValueError:
+                    seconds = 0.0
+                if not 0 < seconds < float("inf"):
+                    self._reply(f"interval must be a positive number of seconds, not {interval[0]!r}\n", status=400)
+                    return
+                profiler.interval = seconds
+            profiler.clear()
+            profiler.start()
+        elif url.path == "/profile/stop":
+            profiler.stop()
+        else:
+            self._reply("not found\n", status=404)
+            return
+        self._reply(f"profiler {'running' if profiler.running else 'stopped'}, {profiler.samples} samples\n")
+
+    def _reply(self, body, content_type="text/plain", status=200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port, host="127.0.0.1"):
+    """Serve ``/metrics`` and the profiler endpoints from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="sss-metrics-http", daemon=True).start()
+    return server
+
+
+def write_periodically(path, interval=10.0):
+    """Rewrite ``path`` with the Prometheus text every ``interval`` seconds, from a daemon thread."""
+    path = Path(path)
+
+    def run():
+        while True:
+            # Write then rename, so a scraper never reads a half-written file
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_text(registry.prometheus_text(), encoding="utf-8")
+            os.replace(tmp, path)
+            if profiler.samples:
+                path.with_suffix(".folded").write_text(profiler.folded(), encoding="utf-8")
+            time.sleep(interval)
+
+    threading.Thread(target=run, name="sss-metrics-file", daemon=True).start()
+
+
+def start_from_env(environ=os.environ):
+    """Enable metrics and start the exporters the environment asks for; True if any."""
+    port = environ.get("SSS_METRICS_PORT")
+    path = environ.get("SSS_METRICS_FILE")
+    if port:
+        try:
+            serve(int(port))
+        except (OSError, ValueError) as e:
+            # E.g. a second server process on the same port: it runs on, without its own /metrics
+            print(f"metrics: not serving on port {port}: {e}", file=sys.stderr)
+            port = None
+    if path:
+        write_periodically(path, float(environ.get("SSS_METRICS_INTERVAL", 10)))
+    if environ.get("SSS_PROFILE"):
+        profiler.start()
+    registry.enabled = bool(port or path)
+    return registry.enabled
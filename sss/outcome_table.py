@@ -0,0 +1,180 @@
+"""Precomputed outcomes for the whole answer space.
+
+With 10 questions of 4 options plus skip there are only 5 ** 10 (~9.8M)
+possible answer vectors, so every one of them is scored once and stored in a
+flat binary file indexed by ``pack_answers``.  Each record is 7 bytes: the
+winner and the three percentages in units of 0.01%.  The file is memory-mapped
+on load, so a lookup is a single array index with no scoring work.
+
+The header records the ``weights_digest`` of the weights the table was built
+from; ``load_table`` rebuilds the file whenever the quiz weights change.
+
+The table serves bulk lookups (``python -m sss.classify --table``) and the
+adaptive question order.  The app scores its live session from the integer
+totals ``QuizRecord`` keeps as answers come in, which is cheaper than a table
+lookup, exact rather than rounded to 0.01%, and needs no 68 MB file.
+
+Usage::
+
+    python -m sss.outcome_table build [--path FILE]
+    python -m sss.outcome_table stats [--path FILE]
+    python -m sss.outcome_table verify [--path FILE]
+"""
+
+import argparse
+import hashlib
+import os
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from sss.scoring import CATEGORIES, LABELS, N_QUESTIONS, SKIP, pack_answers, score, unpack_answers, weights_digest
+
+DEFAULT_PATH = Path(os.environ.get("SSS_OUTCOME_TABLE", Path(__file__).resolve().parent.parent / "outcome_table.bin"))
+
+MAGIC = b"SSSOUT01"
+# magic, n_questions, base, n_records, weights digest, payload digest
+HEADER = struct.Struct("<8sIIQ32s32s")
+HEADER_SIZE = 128
+
+RECORD = np.dtype([("winner", "u1"), ("soup", "<u2"), ("salad", "<u2"), ("sandwich", "<u2")])
+PCT_SCALE = 100  # stored value = percentage * PCT_SCALE
+
+N_RECORDS = (SKIP + 1) ** N_QUESTIONS
+BUILD_CHUNK = (SKIP + 1) ** 8
+_PLACES = [(SKIP + 1) ** q for q in range(N_QUESTIONS)]
+
+
+class StaleTableError(Exception):
+    """The table on disk was built for different weights (or is not a table)."""
+
+
+def _records_for(packed):
+    pcts, winner = score(unpack_answers(packed))
+    records = np.empty(len(packed), dtype=RECORD)
+    records["winner"] = winner
+    quantized = np.rint(pcts * PCT_SCALE).astype(np.uint16)
+    for c_idx, cat in enumerate(CATEGORIES):
+        records[cat] = quantized[:, c_idx]
+    return records
+
+
+def build_table(path=DEFAULT_PATH):
+    """Score every answer vector and write the table atomically to ``path``."""
+    path = Path(path)
+    tmp = path.with_name(path.name + f".tmp{os.getpid()}")
+    payload_hash = hashlib.sha256()
+    try:
+        with open(tmp, "wb") as f:
+            f.write(b"\0" * HEADER_SIZE)
+            for start in range(0, N_RECORDS, BUILD_CHUNK):
+                packed = np.arange(start, min(start + BUILD_CHUNK, N_RECORDS), dtype=np.int64)
+                data = _records_for(packed).tobytes()
+                payload_hash.update(data)
+                f.write(data)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, N_QUESTIONS, SKIP + 1, N_RECORDS,
+                                bytes.fromhex(weights_digest()), payload_hash.digest()))
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return path
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER.size:
+        raise StaleTableError(f"{path}: truncated header")
+    magic, n_questions, base, n_records, digest, payload_digest = HEADER.unpack_from(raw)
+    if magic != MAGIC:
+        raise StaleTableError(f"{path}: not an outcome table")
+    return {
+        "n_questions": n_questions,
+        "base": base,
+        "n_records": n_records,
+        "weights_digest": digest.hex(),
+        "payload_digest": payload_digest.hex(),
+    }
+
+
+class OutcomeTable:
+    """Read-only, memory-mapped view of a built table."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = Path(path)
+        self.header = read_header(self.path)
+        expected = (N_QUESTIONS, SKIP + 1, N_RECORDS, weights_digest())
+        found = tuple(self.header[k] for k in ("n_questions", "base", "n_records", "weights_digest"))
+        if found != expected:
+            raise StaleTableError(f"{self.path}: built for different weights")
+        if self.path.stat().st_size != HEADER_SIZE + N_RECORDS * RECORD.itemsize:
+            raise StaleTableError(f"{self.path}: unexpected file size")
+        self.records = np.memmap(self.path, dtype=RECORD, mode="r", offset=HEADER_SIZE, shape=(N_RECORDS,))
+
+    def lookup(self, answers):
+        """Outcome for one answer vector: ``(winner_label, (soup, salad, sandwich))``."""
+        rec = self.records[sum(int(a) * p for a, p in zip(answers, _PLACES))]
+        return LABELS[rec["winner"]], tuple(int(rec[cat]) / PCT_SCALE for cat in CATEGORIES)
+
+    def lookup_batch(self, answers):
+        """Vectorized lookup: ``(pcts, winner_idx)`` like ``sss.scoring.score``."""
+        recs = self.records[pack_answers(answers)]
+        pcts = np.stack([recs[cat] for cat in CATEGORIES], axis=-1) / PCT_SCALE
+        return pcts, recs["winner"].astype(np.intp)
+
+    def winner_counts(self):
+        """How many answer paths end in each category."""
+        counts = np.bincount(self.records["winner"], minlength=len(LABELS))
+        return dict(zip(LABELS, counts.tolist()))
+
+    def verify(self):
+        """Recompute the payload checksum; True if it matches the header."""
+        h = hashlib.sha256()
+        raw = self.records.view(np.uint8)
+        for start in range(0, len(raw), 1 << 24):
+            h.update(raw[start:start + (1 << 24)].tobytes())
+        return h.hexdigest() == self.header["payload_digest"]
+
+
+def load_table(path=DEFAULT_PATH, rebuild=True):
+    """Open the table, (re)building it first if it is missing or stale."""
+    try:
+        return OutcomeTable(path)
+    except (FileNotFoundError, StaleTableError):
+        if not rebuild:
+            raise
+    build_table(path)
+    return OutcomeTable(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sss.outcome_table",
+                                     description="Build and inspect the precomputed outcome table.")
+    parser.add_argument("command", choices=["build", "stats", "verify"])
+    parser.add_argument("--path", default=DEFAULT_PATH, type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        build_table(args.path)
+        print(f"wrote {N_RECORDS} records to {args.path}")
+        return 0
+
+    table = load_table(args.path)
+    if args.command == "verify":
+        ok = table.verify()
+        print(f"{args.path}: {'ok' if ok else 'CHECKSUM MISMATCH'}")
+        return 0 if ok else 1
+
+    counts = table.winner_counts()
+    for label, n in counts.items():
+        print(f"{label:<9} {n:>9}  {n / N_RECORDS:6.2%}")
+    print(f"{'total':<9} {N_RECORDS:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
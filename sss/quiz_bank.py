@@ -0,0 +1,95 @@
+"""The question bank: every question, its options and their per-category impacts."""
+
+# Food classification questions (10 questions - streamlined)
+QUIZ_QUESTIONS = [
+    {
+        "question": "How is this food usually served?",
+        "options": [
+            {"text": "Piping hot with steam", "soup": 20, "salad": -10, "sandwich": 0, "reason_soup": "Hot temperature is classic for soups", "reason_salad": "Salads are typically cold", "reason_sandwich": "Temperature varies for sandwiches"},
+            {"text": "Warm", "soup": 10, "salad": 0, "sandwich": 5, "reason_soup": "Warm works for some soups", "reason_salad": "Neutral for salad", "reason_sandwich": "Warm sandwiches exist"},
+            {"text": "Room temperature", "soup": 0, "salad": 5, "sandwich": 5, "reason_soup": "Room temp is unusual for soup", "reason_salad": "Common for salads", "reason_sandwich": "Common for sandwiches"},
+            {"text": "Cold or chilled", "soup": -15, "salad": 25, "sandwich": 5, "reason_soup": "Cold ruins most soups", "reason_salad": "Salads are typically cold", "reason_sandwich": "Cold sandwiches are common"},
+        ]
+    },
+    {
+        "question": "How much liquid or broth does it contain?",
+        "options": [
+            {"text": "Mostly liquid or broth", "soup": 25, "salad": -15, "sandwich": -20, "reason_soup": "High liquid content defines soup", "reason_salad": "Salads are not liquid-based", "reason_sandwich": "Bread-based foods aren't liquid"},
+            {"text": "Some liquid with solid chunks", "soup": 15, "salad": 0, "sandwich": -5, "reason_soup": "Chunky soups are classic", "reason_salad": "Minimal liquid for salad", "reason_sandwich": "Not typical for sandwiches"},
+            {"text": "Mostly dry with light sauce", "soup": -10, "salad": 15, "sandwich": 10, "reason_soup": "Dry contradicts soup nature", "reason_salad": "Salads are generally dry", "reason_sandwich": "Dry works for sandwiches"},
+            {"text": "Completely dry, no liquid", "soup": -25, "salad": 20, "sandwich": 20, "reason_soup": "No liquid means not soup", "reason_salad": "Dry fits salad profile", "reason_sandwich": "Dry fits sandwich profile"},
+        ]
+    },
+    {
+        "question": "Is bread the main vessel or essential component?",
+        "options": [
+            {"text": "Yes, food is in or on bread", "soup": -20, "salad": -10, "sandwich": 30, "reason_soup": "Bread is not core to soup", "reason_salad": "Salad doesn't center on bread", "reason_sandwich": "Bread is the defining feature"},
+            {"text": "Bread served on the side", "soup": 5, "salad": 5, "sandwich": 10, "reason_soup": "Bread as side is optional", "reason_salad": "Bread complements but not required", "reason_sandwich": "Bread enhances sandwiches"},
+            {"text": "No bread involved", "soup": 10, "salad": 15, "sandwich": -15, "reason_soup": "No bread is typical for soup", "reason_salad": "No bread is typical for salad", "reason_sandwich": "Bread-free means not sandwich"},
+            {"text": "Sometimes, varies", "soup": 0, "salad": 5, "sandwich": 0, "reason_soup": "Variable bread doesn't help", "reason_salad": "Can be flexible", "reason_sandwich": "Inconsistent with sandwich"},
+        ]
+    },
+    {
+        "question": "How is it typically eaten?",       
+        "options": [
+            {"text": "With a spoon", "soup": 25, "salad": -10, "sandwich": -20, "reason_soup": "Spoon is the ideal for soup", "reason_salad": "Forks are better for salad", "reason_sandwich": "Hand or utensils, not spoon"},
+            {"text": "With a fork", "soup": -10, "salad": 25, "sandwich": 0, "reason_soup": "Fork is unsuitable for soup", "reason_salad": "Fork is the salad standard", "reason_sandwich": "Neutral for sandwiches"},
+            {"text": "With hands", "soup": -20, "salad": 0, "sandwich": 25, "reason_soup": "Hard to eat soup by hand", "reason_salad": "Possible but not typical", "reason_sandwich": "Hand-held is sandwich signature"},
+            {"text": "Knife and fork", "soup": 0, "salad": 10, "sandwich": 10, "reason_soup": "Knife fork for soup is uncommon", "reason_salad": "Works for substantial salads", "reason_sandwich": "Works for some sandwiches"},
+        ]
+    },
+    {
+        "question": "Does it feature fresh leafy greens or raw vegetables as a main component?",
+        "options": [
+            {"text": "Yes, leaves or raw veggies are primary", "soup": -20, "salad": 30, "sandwich": 5, "reason_soup": "Fresh greens aren't soup base", "reason_salad": "Fresh greens define salad", "reason_sandwich": "Greens add to sandwiches"},
+            {"text": "Some greens but not main", "soup": 0, "salad": 10, "sandwich": 5, "reason_soup": "Few greens okay for soup", "reason_salad": "Supportive role for greens", "reason_sandwich": "Greens support sandwich"},
+            {"text": "No leafy greens", "soup": 10, "salad": -15, "sandwich": 10, "reason_soup": "Many soups have no greens", "reason_salad": "No greens hurts salad identity", "reason_sandwich": "Greens optional in sandwiches"},
+            {"text": "Varies by preparation", "soup": 0, "salad": 0, "sandwich": 0, "reason_soup": "Variable doesn't help classify", "reason_salad": "Variable doesn't help classify", "reason_sandwich": "Variable doesn't help classify"},
+        ]
+    },
+    {
+        "question": "Is it portable and commonly eaten on the go?",
+        "options": [
+            {"text": "Very portable, hand-held", "soup": -25, "salad": -5, "sandwich": 30, "reason_soup": "Soups spill when mobile", "reason_salad": "Salads need containment", "reason_sandwich": "Sandwiches are grab and go"},
+            {"text": "Somewhat portable", "soup": 0, "salad": 5, "sandwich": 10, "reason_soup": "Soups need careful transport", "reason_salad": "Salads can travel in containers", "reason_sandwich": "Most sandwiches are portable"},
+            {"text": "Not very portable", "soup": 10, "salad": 5, "sandwich": -10, "reason_soup": "Soups are eaten at table", "reason_salad": "Salads eaten at table", "reason_sandwich": "Sandwiches are usually portable"},
+            {"text": "Depends on serving style", "soup": 0, "salad": 0, "sandwich": 0, "reason_soup": "Variable doesn't indicate", "reason_salad": "Variable doesn't indicate", "reason_sandwich": "Variable doesn't indicate"},
+        ]
+    },
+    {
+        "question": "Can it be sipped or slurped?",
+        "options": [
+            {"text": "Yes, it is sippable or slurpable", "soup": 30, "salad": -20, "sandwich": -20, "reason_soup": "Sipping is soup characteristic", "reason_salad": "Salads cannot be sipped", "reason_sandwich": "Sandwiches cannot be sipped"},
+            {"text": "Partially, some parts are sippable", "soup": 15, "salad": 0, "sandwich": 0, "reason_soup": "Some liquid to sip indicates soup", "reason_salad": "Not typical for salad", "reason_sandwich": "Not typical for sandwich"},
+            {"text": "No, not sippable", "soup": -20, "salad": 15, "sandwich": 15, "reason_soup": "Non-sippable isn't soup", "reason_salad": "Salads aren't sippable", "reason_sandwich": "Sandwiches aren't sippable"},
+            {"text": "Not applicable", "soup": 0, "salad": 0, "sandwich": 0, "reason_soup": "Can't determine", "reason_salad": "Can't determine", "reason_sandwich": "Can't determine"},
+        ]
+    },
+    {
+        "question": "What is the primary role of this food in a meal?",
+        "options": [
+            {"text": "Starter or appetizer", "soup": 15, "salad": 10, "sandwich": -5, "reason_soup": "Soups are classic starters", "reason_salad": "Salads work as openers", "reason_sandwich": "Sandwiches are usually mains"},
+            {"text": "Main course", "soup": 5, "salad": 0, "sandwich": 15, "reason_soup": "Soups can be mains", "reason_salad": "Salads rarely main focus", "reason_sandwich": "Sandwiches are main courses"},
+            {"text": "Side or small plate", "soup": 0, "salad": 15, "sandwich": 0, "reason_soup": "Soups standalone", "reason_salad": "Salads work as sides", "reason_sandwich": "Sandwiches are substantial"},
+            {"text": "Snack", "soup": -10, "salad": 0, "sandwich": 20, "reason_soup": "Soups aren't typical snacks", "reason_salad": "Salads not common snacks", "reason_sandwich": "Sandwiches are perfect snacks"},
+        ]
+    },
+    {
+        "question": "Does it have multiple toppings or customizable components?",
+        "options": [
+            {"text": "Lots of toppings or variations", "soup": 0, "salad": 20, "sandwich": 20, "reason_soup": "Soups are fixed recipes", "reason_salad": "Salads thrive on toppings", "reason_sandwich": "Sandwiches are very customizable"},
+            {"text": "Some customization options", "soup": 5, "salad": 10, "sandwich": 10, "reason_soup": "Some soups allow tweaks", "reason_salad": "Moderate customization typical", "reason_sandwich": "Common to customize"},
+            {"text": "Fixed recipe, no variations", "soup": 15, "salad": -10, "sandwich": -5, "reason_soup": "Fixed recipes common for soups", "reason_salad": "Salads invite customization", "reason_sandwich": "Sandwiches are customizable"},
+            {"text": "Varies", "soup": 0, "salad": 0, "sandwich": 0, "reason_soup": "Can't determine", "reason_salad": "Can't determine", "reason_sandwich": "Can't determine"},
+        ]
+    },
+    {
+        "question": "What texture or consistency best describes it?",
+        "options": [
+            {"text": "Smooth and creamy", "soup": 20, "salad": -10, "sandwich": 0, "reason_soup": "Creamy soups are common", "reason_salad": "Salads are crisp not creamy", "reason_sandwich": "Not typical for sandwiches"},
+            {"text": "Chunky pieces in broth", "soup": 20, "salad": 5, "sandwich": -5, "reason_soup": "Classic chunky soup", "reason_salad": "Some texture variety", "reason_sandwich": "Less common structure"},
+            {"text": "Crisp and crunchy", "soup": -20, "salad": 25, "sandwich": 15, "reason_soup": "Crispy contradicts soup", "reason_salad": "Crisp texture is salad signature", "reason_sandwich": "Crispy crusts common"},
+            {"text": "Mixed textures", "soup": 5, "salad": 15, "sandwich": 20, "reason_soup": "Some texture variety okay", "reason_salad": "Multiple textures in salad", "reason_sandwich": "Layers have varied texture"},
+        ]
+    },
+]
@@ -0,0 +1,11 @@
+"""Where the quiz runs, chosen per session with ``?mode=``.
+
+Kept apart from ``sss.client_quiz`` so that picking a mode does not declare
+the browser component: only sessions in client mode import it.
+"""
+
+import os
+
+# "server": every answer is a (fragment) rerun; "client": the sss.client_quiz component
+QUIZ_MODES = ("server", "client")
+DEFAULT_QUIZ_MODE = os.environ.get("SSS_QUIZ_MODE", "server")
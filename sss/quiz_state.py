@@ -0,0 +1,198 @@
+"""Compact per-session quiz record.
+
+Each session used to keep its progress in several objects: float running
+totals, an ``answers`` dict of option texts, a ``choices`` dict and a growing
+``reasoning_data`` list.  ``QuizRecord`` holds the same information in one
+fixed-size byte array (the option picked per question, with an "unanswered"
+sentinel, and the order questions were asked in), three integer totals and a
+``ReasonTally`` whose reasons are references into the shared quiz bank, kept
+up to date as answers come in so the results screen only reads it.
+
+``python -m sss.quiz_state`` measures the per-session bytes of the old and
+the compact layout.
+"""
+
+import argparse
+import gc
+import random
+import sys
+import types
+from array import array
+
+from sss.explain import ReasonTally, reasoning_entries, reasoning_entry
+from sss.quiz_bank import QUIZ_QUESTIONS
+from sss.scoring import _WEIGHT_LISTS, CATEGORIES, N_QUESTIONS, SKIP, START_SCORE, WEIGHTS, normalize_pcts
+
+# Choice byte of a question that has not been asked yet
+UNANSWERED = 0xFF
+
+# Byte layout: choices per question, then question indices in asked order, then the count
+_ORDER = N_QUESTIONS
+_COUNT = 2 * N_QUESTIONS
+
+# Options per question; any other o_idx but SKIP is rejected by record()
+_N_OPTIONS = tuple(len(q["options"]) for q in QUIZ_QUESTIONS)
+
+
+class QuizRecord:
+    """One session's answers, the order they were given in, the running totals and reasons."""
+
+    __slots__ = ("_data", "deltas", "tally")
+
+    def __init__(self):
+        self._data = bytearray([UNANSWERED] * N_QUESTIONS + [0] * (N_QUESTIONS + 1))
+        # Integer sum of every recorded impact, per category
+        self.deltas = array("i", [0] * len(CATEGORIES))
+        self.tally = ReasonTally()
+
+    @classmethod
+    def from_answers(cls, answers):
+        """Record built from a complete answer vector, in question order."""
+        record = cls()
+        for q_idx, o_idx in enumerate(answers):
+            record.record(q_idx, o_idx)
+        return record
+
+    @property
+    def n_asked(self):
+        return self._data[_COUNT]
+
+    def choice(self, q_idx):
+        """Option index (``SKIP`` for a skip) recorded for q_idx, or None if not asked yet."""
+        o_idx = self._data[q_idx]
+        return None if o_idx == UNANSWERED else o_idx
+
+    def record(self, q_idx, o_idx):
+        """Record the option (or ``SKIP``) picked for q_idx.
+
+        Raises ``ValueError`` for an unknown question or option, or a question
+        that was already answered; the record is left unchanged.
+        """
+        if not 0 <= q_idx < N_QUESTIONS:
+            raise ValueError(f"no question {q_idx}")
+        if o_idx != SKIP and not 0 <= o_idx < _N_OPTIONS[q_idx]:
+            raise ValueError(f"question {q_idx} has no option {o_idx}")
+        if self._data[q_idx] != UNANSWERED:
+            raise ValueError(f"question {q_idx} was already answered")
+        self._data[q_idx] = o_idx
+        self._data[_ORDER + self._data[_COUNT]] = q_idx
+        self._data[_COUNT] += 1
+        for c_idx, impact in enumerate(_WEIGHT_LISTS[q_idx][o_idx]):
+            self.deltas[c_idx] += impact
+        self.tally.add(q_idx, o_idx)
+
+    def order(self):
+        """Asked question indices, in the order they were asked."""
+        return list(self._data[_ORDER:_ORDER + self._data[_COUNT]])
+
+    def choices(self):
+        """``{q_idx: o_idx}`` for every asked question, in asked order."""
+        return {q_idx: self._data[q_idx] for q_idx in self.order()}
+
+    def answers(self):
+        """Option index (``SKIP`` for a skip) per question, None where never asked."""
+        return [self.choice(q_idx) for q_idx in range(N_QUESTIONS)]
+
+    def remaining(self):
+        return [q_idx for q_idx in range(N_QUESTIONS) if self._data[q_idx] == UNANSWERED]
+
+    def totals(self):
+        """Raw soup / salad / sandwich scores, as ``sss.scoring.raw_scores`` computes them."""
+        return tuple(START_SCORE + d for d in self.deltas)
+
+    def pcts(self):
+        return normalize_pcts(*self.totals())
+
+    def explain(self):
+        """Winner, per-category reasons, summary and bullets, as tallied so far."""
+        return self.tally.explain(self.pcts())
+
+
+# Measuring ---------------------------------------------------------------
+
+def _reachable(roots):
+    seen = {}
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, (type, types.ModuleType, types.FunctionType)):
+            continue
+        seen[id(obj)] = obj
+        stack.extend(gc.get_referents(obj))
+    return seen
+
+
+def session_nbytes(values, shared=()):
+    """Bytes held by ``values`` that are not shared with ``shared`` (or interned small ints)."""
+    exclude = _reachable(shared)
+    total = 0
+    for obj_id, obj in _reachable(values).items():
+        if obj_id in exclude or (type(obj) is int and -5 <= obj <= 256) or obj is None or type(obj) is bool:
+            continue
+        total += sys.getsizeof(obj)
+    return total
+
+
+def previous_state(path):
+    """Session values as the app kept them before ``QuizRecord``."""
+    soup = salad = sandwich = START_SCORE
+    answers, reasoning_data, choices = {}, [], {}
+    for q_idx, o_idx in path:
+        soup_d, salad_d, sandwich_d = WEIGHTS[q_idx, o_idx].tolist()
+        soup, salad, sandwich = soup + soup_d, salad + salad_d, sandwich + sandwich_d
+        reasoning_data.append(reasoning_entry(q_idx, o_idx))
+        if o_idx != SKIP:
+            answers[q_idx] = QUIZ_QUESTIONS[q_idx]["options"][o_idx]["text"]
+        choices[q_idx] = o_idx
+    return [len(path), soup, salad, sandwich, answers, reasoning_data, choices]
+
+
+def original_state(path):
+    """Session values as the original app built them: fresh tuples and impact dicts per answer."""
+    state = previous_state(path)
+    state[5] = [
+        (q_idx, entry[1], dict(entry[2]), entry[3])
+        for (q_idx, _), entry in zip(path, state[5])
+    ]
+    return state
+
+
+def compact_state(path):
+    record = QuizRecord()
+    for q_idx, o_idx in path:
+        record.record(q_idx, o_idx)
+    return [record]
+
+
+def measure(n_sessions=1000, seed=0):
+    """Mean bytes per completed session for each layout."""
+    rng = random.Random(seed)
+    shared = (QUIZ_QUESTIONS, reasoning_entries())
+    layouts = {"original": original_state, "previous": previous_state, "compact": compact_state}
+    totals = dict.fromkeys(layouts, 0)
+    for _ in range(n_sessions):
+        path = [(q_idx, rng.randrange(SKIP + 1)) for q_idx in range(N_QUESTIONS)]
+        for name, build in layouts.items():
+            totals[name] += session_nbytes(build(path), shared)
+    return {name: total / n_sessions for name, total in totals.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sss.quiz_state",
+                                     description="Measure per-session bytes of the quiz state layouts.")
+    parser.add_argument("--sessions", type=int, default=1000, help="random completed quizzes to measure")
+    args = parser.parse_args(argv)
+
+    results = measure(args.sessions)
+    compact = results["compact"]
+    print(f"{'layout':<10}{'bytes/session':>15}")
+    for name, nbytes in results.items():
+        print(f"{name:<10}{nbytes:>15.0f}")
+    for name in ("original", "previous"):
+        print(f"compact saves {results[name] - compact:.0f} bytes per session vs {name} "
+              f"({1 - compact / results[name]:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Measure what each quiz interaction costs the server and the websocket.
+
+Drives a full classification (load, Start, every question answered with
+Next, Classify Another Food) against a running app or a freshly started one,
+several times, and reports per interaction type the latency until the script
+run finishes, the number of script runs, forward messages and bytes sent.
+With ``--mode client`` the quiz runs in the browser-side component, so a
+classification is the page load, one submission of the answers and the reset.
+
+Pointing ``--script`` at an older checkout of ``streamlit_app.py`` gives a
+before/after comparison::
+
+    python -m sss.rerun_cost --json after.json
+    python -m sss.rerun_cost --script /tmp/before/streamlit_app.py --json before.json
+    python -m sss.rerun_cost --mode client
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+
+from sss.session_client import APP_SCRIPT, SessionClient, serve_app
+
+
+# Option picked for each question (list order)
+ANSWER_PATH = (0, 1, 2, 3, 0, 1, 2, 3, 0, 1)
+
+
+async def run_session(url, query_string="", mode="server", path=ANSWER_PATH):
+    """One full classification; returns the list of ``Interaction`` results."""
+    results = []
+    async with SessionClient(url, query_string) as client:
+        results.append(await client.load())
+        if mode == "client":
+            quiz = client.find("component_instance")
+            results.append(await client.submit(quiz, {"answers": list(path)}, "submit"))
+        else:
+            results.append(await client.click(client.find("button", "Start Classification"), "start"))
+            for o_idx in path:
+                radio = client.find("radio")
+                if radio is None:
+                    break
+                client.set_value(radio, radio.proto.options[o_idx])
+                results.append(await client.click(client.find("button", "Next"), "next"))
+        results.append(await client.click(client.find("button", "Classify Another Food"), "reset"))
+    return results
+
+
+def summarize(sessions):
+    """Mean cost per interaction name over all sessions."""
+    by_name = {}
+    for results in sessions:
+        for r in results:
+            by_name.setdefault(r.name, []).append(r)
+    summary = {}
+    for name, rs in by_name.items():
+        summary[name] = {
+            "count": len(rs),
+            "latency_ms": round(statistics.mean(r.latency for r in rs) * 1000, 2),
+            "script_runs": round(statistics.mean(r.script_runs for r in rs), 2),
+            "messages": round(statistics.mean(r.messages for r in rs), 2),
+            "bytes": round(statistics.mean(r.bytes for r in rs), 1),
+            "fragment_runs": sum(r.fragment for r in rs),
+        }
+    return summary
+
+
+def format_summary(summary):
+    lines = [f"{'interaction':<12}{'count':>7}{'latency ms':>12}{'runs':>7}{'msgs':>7}{'bytes':>10}{'fragment':>10}"]
+    for name, s in summary.items():
+        lines.append(f"{name:<12}{s['count']:>7}{s['latency_ms']:>12.1f}{s['script_runs']:>7.1f}"
+                     f"{s['messages']:>7.1f}{s['bytes']:>10.0f}{s['fragment_runs']:>10}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sss.rerun_cost", description=__doc__.split("\n\n")[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="measure an already running app")
+    target.add_argument("--script", default=APP_SCRIPT, help="app script to start (default: this checkout)")
+    parser.add_argument("--sessions", type=int, default=5, help="full classifications to run (default 5)")
+    parser.add_argument("--mode", choices=["server", "client"], default="server", help="quiz mode to drive")
+    parser.add_argument("--query", default="", help="query string, e.g. chart=svg")
+    parser.add_argument("--json", help="write the summary here")
+    args = parser.parse_args(argv)
+
+    query = "&".join(filter(None, [args.query, "mode=client" if args.mode == "client" else ""]))
+
+    async def measure(url):
+        # The first session warms caches and imports; it is not reported
+        await run_session(url, query, args.mode)
+        return [await run_session(url, query, args.mode) for _ in range(args.sessions)]
+
+    if args.url:
+        sessions = asyncio.run(measure(args.url))
+    else:
+        # Keep benchmark sessions out of the server's results store
+        with serve_app(args.script, env={"SSS_RESULTS_DB": ""}) as (url, _proc):
+            sessions = asyncio.run(measure(url))
+
+    summary = summarize(sessions)
+    print(format_summary(summary))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""Local SQLite store of finished classifications.
+
+Every completed quiz is saved as one row: the packed answer vector (see
+``pack_answers``; questions a quiz never asked are packed as skips), a bit
+mask of the questions that were asked, the winner and the three percentages.
+
+The app never touches the database on the request path.  ``ResultsWriter``
+queues results in memory and a background thread writes them in batches, one
+transaction per batch.  The same transaction folds the batch into small summary
+tables (per-winner counts and percentage sums, per-question option counts).
+Aggregates therefore read a few dozen rows, however many results are stored.
+
+The database lives at ``SSS_RESULTS_DB`` (default ``results.db`` next to the
+app); setting it to an empty string turns saving off.
+
+Usage::
+
+    python -m sss.results_store stats [--path FILE]
+    python -m sss.results_store rebuild-summaries [--path FILE]
+"""
+
+import argparse
+import atexit
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from sss.scoring import CATEGORIES, LABELS, N_QUESTIONS, SKIP
+
+DEFAULT_PATH = os.environ.get("SSS_RESULTS_DB", str(Path(__file__).resolve().parent.parent / "results.db")) or None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    answers INTEGER NOT NULL,
+    asked INTEGER NOT NULL,
+    winner INTEGER NOT NULL,
+    soup REAL NOT NULL,
+    salad REAL NOT NULL,
+    sandwich REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS winner_summary (
+    winner INTEGER PRIMARY KEY,
+    n INTEGER NOT NULL,
+    soup_sum REAL NOT NULL,
+    salad_sum REAL NOT NULL,
+    sandwich_sum REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS option_summary (
+    q_idx INTEGER NOT NULL,
+    o_idx INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (q_idx, o_idx)
+);
+"""
+
+_INSERT_RESULT = ("INSERT INTO results (created, answers, asked, winner, soup, salad, sandwich) "
+                  "VALUES (?, ?, ?, ?, ?, ?, ?)")
+_UPSERT_WINNER = ("INSERT INTO winner_summary VALUES (?, ?, ?, ?, ?) ON CONFLICT (winner) DO UPDATE SET "
+                  "n = n + excluded.n, soup_sum = soup_sum + excluded.soup_sum, "
+                  "salad_sum = salad_sum + excluded.salad_sum, sandwich_sum = sandwich_sum + excluded.sandwich_sum")
+_UPSERT_OPTION = ("INSERT INTO option_summary VALUES (?, ?, ?) ON CONFLICT (q_idx, o_idx) DO UPDATE SET "
+                  "n = n + excluded.n")
+
+
+def connect(path=DEFAULT_PATH):
+    """Open (and if needed create) the store."""
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    # WAL lets the aggregates page read while the writer commits
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _summarize(rows):
+    """Summary-table increments for a batch of result rows."""
+    winners = {}
+    options = Counter()
+    for _created, packed, asked, winner, *pcts in rows:
+        n, *sums = winners.get(winner, (0, 0.0, 0.0, 0.0))
+        winners[winner] = (n + 1, *(s + p for s, p in zip(sums, pcts)))
+        # Option frequencies count asked questions only (skips included)
+        for q_idx in range(N_QUESTIONS):
+            packed, o_idx = divmod(packed, SKIP + 1)
+            if asked >> q_idx & 1:
+                options[q_idx, o_idx] += 1
+    return winners, options
+
+
+def write_batch(conn, rows):
+    """Insert result rows and fold them into the summary tables, in one transaction."""
+    winners, options = _summarize(rows)
+    with conn:
+        conn.executemany(_INSERT_RESULT, rows)
+        conn.executemany(_UPSERT_WINNER, [(w, *v) for w, v in winners.items()])
+        conn.executemany(_UPSERT_OPTION, [(q, o, n) for (q, o), n in options.items()])
+
+
+def result_row(answers, winner, pcts, created=None):
+    """One ``results`` row.
+
+    ``answers`` holds an option index, ``SKIP`` or None (never asked) per
+    question; ``winner`` indexes ``LABELS``.
+    """
+    asked = packed = 0
+    # Same packing as sss.scoring.pack_answers, without numpy overhead for a single row
+    for q_idx in reversed(range(N_QUESTIONS)):
+        o_idx = answers[q_idx]
+        packed = packed * (SKIP + 1) + (SKIP if o_idx is None else o_idx)
+        if o_idx is not None:
+            asked |= 1 << q_idx
+    return (time.time() if created is None else created, packed, asked, int(winner), *(float(p) for p in pcts))
+
+
+class ResultsWriter:
+    """Background batched writer: ``submit`` never waits on the database.
+
+    Results are queued and written by a daemon thread in batches of up to
+    ``batch_size`` rows, or whatever has arrived after ``flush_interval``
+    seconds.  When more than ``max_pending`` results are waiting, new ones are
+    dropped (and counted) rather than blocking the caller.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, batch_size=500, flush_interval=1.0, max_pending=100000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self._queue = queue.Queue(max_pending)
+        self._conn = connect(path)
+        self._thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, answers, winner, pcts):
+        """Queue one finished classification (see ``result_row``); False if it had to be dropped."""
+        try:
+            self._queue.put_nowait(result_row(answers, winner, pcts))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout=None):
+        """Block until everything submitted so far is written."""
+        done = threading.Event()
+        self._queue.put(done, timeout=timeout)
+        return done.wait(timeout)
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def stats(self):
+        return {"written": self.written, "pending": self._queue.qsize(), "dropped": self.dropped,
+                "errors": self.errors}
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch, waiters, stop = [], [], False
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or waiters or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    write_batch(self._conn, batch)
+                    self.written += len(batch)
+                except sqlite3.Error as e:
+                    self.errors += 1
+                    print(f"results store: dropping {len(batch)} results: {e}", file=sys.stderr)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                self._conn.close()
+                return
+
+
+def read_aggregates(path=DEFAULT_PATH):
+    """Aggregates from the summary tables only (no scan of ``results``).
+
+    Returns ``{"total", "winners": {label: n}, "avg_pcts": {category: pct},
+    "options": [[n per option..., n skipped] per question]}``.  The database
+    is opened read-only; a missing one reads as no results (and is not created).
+    """
+    winner_rows, option_rows = [], []
+    if os.path.exists(path):
+        conn = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            winner_rows = conn.execute("SELECT winner, n, soup_sum, salad_sum, sandwich_sum FROM winner_summary").fetchall()
+            option_rows = conn.execute("SELECT q_idx, o_idx, n FROM option_summary").fetchall()
+        finally:
+            conn.close()
+    winners = dict.fromkeys(LABELS, 0)
+    sums = [0.0] * len(CATEGORIES)
+    for winner, n, *pct_sums in winner_rows:
+        winners[LABELS[winner]] = n
+        sums = [s + p for s, p in zip(sums, pct_sums)]
+    total = sum(winners.values())
+    options = [[0] * (SKIP + 1) for _ in range(N_QUESTIONS)]
+    for q_idx, o_idx, n in option_rows:
+        options[q_idx][o_idx] = n
+    return {
+        "total": total,
+        "winners": winners,
+        "avg_pcts": {cat: (s / total if total else 0.0) for cat, s in zip(CATEGORIES, sums)},
+        "options": options,
+    }
+
+
+def rebuild_summaries(path=DEFAULT_PATH, chunk_size=100000):
+    """Recompute the summary tables from ``results`` (a full scan; for repairs).
+
+    One transaction: readers see the old summaries until the new ones are
+    complete, and a failure part way leaves the old ones in place.
+    """
+    conn = connect(path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM winner_summary")
+            conn.execute("DELETE FROM option_summary")
+            cursor = conn.execute("SELECT created, answers, asked, winner, soup, salad, sandwich FROM results")
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                winners, options = _summarize(rows)
+                conn.executemany(_UPSERT_WINNER, [(w, *v) for w, v in winners.items()])
+                conn.executemany(_UPSERT_OPTION, [(q, o, n) for (q, o), n in options.items()])
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sss.results_store",
+                                     description="Inspect the stored classification results.")
+    parser.add_argument("command", choices=["stats", "rebuild-summaries"])
+    parser.add_argument("--path", default=DEFAULT_PATH, type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild-summaries":
+        rebuild_summaries(args.path)
+    agg = read_aggregates(args.path)
+    total = agg["total"]
+    for label, n in agg["winners"].items():
+        print(f"{label:<9} {n:>10}  {n / total if total else 0:6.2%}")
+    print(f"{'total':<9} {total:>10}")
+    print("average: " + ", ".join(f"{cat} {pct:.1f}%" for cat, pct in agg["avg_pcts"].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
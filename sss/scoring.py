@@ -0,0 +1,218 @@
+"""Vectorized scoring engine.
+
+``QUIZ_QUESTIONS`` is compiled once into a dense weight tensor of shape
+(questions, options + 1, categories).  The extra option slot is all zeros and
+stands for a skipped question, so skipping is just another index lookup.
+
+Answer vectors hold one option index per question (``SKIP`` for a skipped or
+not yet answered question).  Every function accepts a single vector of shape
+(n_questions,) or a batch of shape (n, n_questions).
+
+``SSS_WEIGHTS`` points the app at a fitted weight table (see
+``sss.fit_weights``) instead of the impacts in ``QUIZ_QUESTIONS``.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from sss.quiz_bank import QUIZ_QUESTIONS
+
+CATEGORIES = ("soup", "salad", "sandwich")
+LABELS = ("SOUP", "SALAD", "SANDWICH")
+
+# Every session starts with the same score in each category
+START_SCORE = 33.33
+
+# Percentages are clamped to this floor before rescaling (see normalize_pcts)
+MIN_SCORE = 0.01
+
+# Bumped whenever the arithmetic behind a score changes, so tables and files
+# stamped with an older weights_digest are recognized as stale
+SCORING_VERSION = 2
+
+
+def compile_weights(questions):
+    """Build the (questions, options + 1, categories) impact tensor.
+
+    Questions with fewer options than the widest one are zero padded; the last
+    slot of every question is the skip slot.
+    """
+    n_options = max(len(q["options"]) for q in questions)
+    weights = np.zeros((len(questions), n_options + 1, len(CATEGORIES)), dtype=np.int16)
+    for q_idx, question in enumerate(questions):
+        for o_idx, opt in enumerate(question["options"]):
+            weights[q_idx, o_idx] = [opt.get(cat, 0) for cat in CATEGORIES]
+    return weights
+
+
+def _digest(weights):
+    h = hashlib.sha256()
+    h.update(repr((weights.shape, str(weights.dtype), START_SCORE, MIN_SCORE, SCORING_VERSION)).encode())
+    h.update(np.ascontiguousarray(weights).tobytes())
+    return h.hexdigest()
+
+
+def option_mask(questions):
+    """True for every (question, option) slot that holds a real option (not skip, not padding)."""
+    n_options = max(len(q["options"]) for q in questions)
+    mask = np.zeros((len(questions), n_options + 1), dtype=bool)
+    for q_idx, question in enumerate(questions):
+        mask[q_idx, :len(question["options"])] = True
+    return mask
+
+
+def load_weights(path, questions=QUIZ_QUESTIONS):
+    """Weight table written by ``sss.fit_weights``, checked against the quiz bank and its digest."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    weights = np.asarray(data["weights"], dtype=np.int16)
+    mask = option_mask(questions)
+    if weights.shape != mask.shape + (len(CATEGORIES),):
+        raise ValueError(f"{path}: expected weights of shape {mask.shape + (len(CATEGORIES),)}, got {weights.shape}")
+    if data.get("scoring_version") != SCORING_VERSION:
+        raise ValueError(f"{path}: fitted for scoring version {data.get('scoring_version')}, "
+                         f"this is version {SCORING_VERSION}")
+    if _digest(weights) != data.get("weights_digest"):
+        raise ValueError(f"{path}: weights do not match their weights_digest")
+    if weights[~mask].any():
+        raise ValueError(f"{path}: skip and padding slots must be zero")
+    return weights
+
+
+WEIGHTS_PATH = os.environ.get("SSS_WEIGHTS")
+WEIGHTS = load_weights(WEIGHTS_PATH) if WEIGHTS_PATH else compile_weights(QUIZ_QUESTIONS)
+N_QUESTIONS = WEIGHTS.shape[0]
+SKIP = WEIGHTS.shape[1] - 1
+
+
+def normalize_pcts(soup, salad, sandwich):
+    """Normalize to 100 total and ensure no negatives"""
+    soup = max(MIN_SCORE, soup)
+    salad = max(MIN_SCORE, salad)
+    sandwich = max(MIN_SCORE, sandwich)
+    total = soup + salad + sandwich
+    return (soup / total * 100, salad / total * 100, sandwich / total * 100)
+
+
+# Plain-int copy of WEIGHTS for scalar lookups, which are slow on numpy arrays
+_WEIGHT_LISTS = WEIGHTS.tolist()
+
+
+def option_impacts(q_idx, o_idx):
+    """Impact dict for one option, in the shape the reasoning helpers expect."""
+    return dict(zip(CATEGORIES, _WEIGHT_LISTS[q_idx][o_idx]))
+
+
+def raw_scores(answers, weights=WEIGHTS):
+    """The start score plus the summed impacts of every answer, per category.
+
+    Impacts are integers and are summed exactly before the start score is
+    added once, like the integer running totals the app keeps per session
+    (see ``sss.quiz_state``), so both agree bit for bit and exact ties stay
+    ties.
+    """
+    answers = np.asarray(answers)
+    single = answers.ndim == 1
+    answers = np.atleast_2d(answers)
+    if answers.shape[1] != weights.shape[0]:
+        raise ValueError(f"expected {weights.shape[0]} answers per row, got {answers.shape[1]}")
+
+    deltas = np.zeros((answers.shape[0], weights.shape[2]), dtype=np.int64)
+    for q_idx in range(weights.shape[0]):
+        deltas += weights[q_idx][answers[:, q_idx]]
+    totals = START_SCORE + deltas
+    return totals[0] if single else totals
+
+
+def normalize_batch(totals):
+    """Vectorized ``normalize_pcts`` over the last axis."""
+    clamped = np.maximum(np.asarray(totals, dtype=np.float64), MIN_SCORE)
+    return clamped / clamped.sum(axis=-1, keepdims=True) * 100
+
+
+def winners(pcts):
+    """Index into ``LABELS`` of the leading category; ties go to the first one."""
+    return np.argmax(pcts, axis=-1)
+
+
+def score(answers, weights=WEIGHTS):
+    """Score answer vectors.
+
+    Returns ``(pcts, winner)``: normalized percentages with the categories on
+    the last axis, and the winning category index.
+    """
+    pcts = normalize_batch(raw_scores(answers, weights))
+    return pcts, winners(pcts)
+
+
+def pack_answers(answers):
+    """Pack answer vectors into integers, one base-(options + 1) digit per question.
+
+    Question 0 is the least significant digit.  With 10 questions of 4 options
+    plus skip this is a number below 5 ** 10.
+    """
+    answers = np.asarray(answers, dtype=np.int64)
+    place = (SKIP + 1) ** np.arange(N_QUESTIONS, dtype=np.int64)
+    return answers @ place
+
+
+def unpack_answers(packed):
+    """Inverse of ``pack_answers``."""
+    packed = np.asarray(packed, dtype=np.int64)
+    place = (SKIP + 1) ** np.arange(N_QUESTIONS, dtype=np.int64)
+    return (packed[..., None] // place) % (SKIP + 1)
+
+
+def weights_digest(weights=WEIGHTS):
+    """SHA-256 of everything that determines a score: the weights and the constants."""
+    return _digest(weights)
+
+
+# Suffix bounds for early termination.  Skipping is always allowed, so every
+# question can also contribute nothing; padding slots are zero like the skip.
+#   SUFFIX_MIN[q, c]: smallest total change to category c over questions q..
+#       (row N_QUESTIONS is all zero)
+#   SUFFIX_MARGIN_MIN[q, a, b]: smallest change of (score a - score b) over
+#       questions q..; questions are independent, so summing per-question
+#       minima gives the exact worst case
+_MARGIN_MIN = (WEIGHTS[:, :, :, None] - WEIGHTS[:, :, None, :]).min(axis=1).astype(np.int64)
+
+
+def _suffix_sums(per_question):
+    zero = np.zeros((1,) + per_question.shape[1:], dtype=np.int64)
+    return np.concatenate([np.cumsum(per_question[::-1], axis=0)[::-1], zero])
+
+
+SUFFIX_MIN = _suffix_sums(WEIGHTS.min(axis=1).astype(np.int64))
+SUFFIX_MARGIN_MIN = _suffix_sums(_MARGIN_MIN)
+
+
+def locked_winner(totals, remaining):
+    """Index of the winner if no answers to the remaining questions can change it.
+
+    ``totals`` are the raw running scores.  ``remaining`` is either the index of
+    the next question (every question from there on is still open) or an
+    iterable of the open question indices.  Returns None while the result is
+    still undecided.
+    """
+    totals = np.asarray(totals, dtype=np.float64)
+    if isinstance(remaining, (int, np.integer)):
+        margin_min = SUFFIX_MARGIN_MIN[remaining]
+        leader_min = SUFFIX_MIN[remaining]
+    else:
+        remaining = list(remaining)
+        margin_min = _MARGIN_MIN[remaining].sum(axis=0)
+        leader_min = WEIGHTS[remaining].min(axis=1).sum(axis=0)
+
+    leader = int(np.argmax(totals))
+    # The leader must stay strictly ahead of every rival and above the clamp
+    # floor, otherwise normalize_pcts could turn the result into a tie
+    if totals[leader] + leader_min[leader] <= MIN_SCORE:
+        return None
+    for rival in range(len(totals)):
+        if rival != leader and totals[leader] - totals[rival] + margin_min[leader, rival] <= 0:
+            return None
+    return leader
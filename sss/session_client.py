@@ -0,0 +1,218 @@
+"""Headless client for a running Streamlit app, speaking its websocket protocol.
+
+One ``SessionClient`` behaves like one browser tab: it keeps the app's current
+widgets, sends clicks and widget values back as ``BackMsg`` rerun requests
+(fragment-scoped when the widget lives in a fragment) and measures every
+interaction: latency until the script run finishes, number of script runs,
+forward messages and bytes received.
+
+``serve_app`` starts ``streamlit run`` on a free local port for tools that
+need their own instance (see ``sss.rerun_cost`` and ``sss.loadgen``).
+
+Needs the ``websockets`` package, from ``requirements-dev.txt``.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+try:
+    import websockets
+except ImportError as e:
+    # Only the measuring tools need it, so it is not an app requirement
+    raise ImportError("sss.session_client needs the websockets package: "
+                      "pip install -r requirements-dev.txt") from e
+
+APP_SCRIPT = Path(__file__).resolve().parent.parent / "streamlit_app.py"
+
+# Statuses that end an interaction; FINISHED_EARLY_FOR_RERUN means st.rerun() queued another run
+_FINAL_STATUSES = {
+    ForwardMsg.FINISHED_SUCCESSFULLY,
+    ForwardMsg.FINISHED_WITH_COMPILE_ERROR,
+    ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+}
+_WIDGET_KINDS = ("button", "checkbox", "radio", "component_instance")
+
+
+@dataclass
+class Interaction:
+    """What one click (or page load) cost, as seen from the client."""
+
+    name: str
+    latency: float = 0.0
+    script_runs: int = 0
+    messages: int = 0
+    bytes: int = 0
+    fragment: bool = False
+    element_counts: dict = field(default_factory=dict)
+
+
+@dataclass
+class Widget:
+    kind: str
+    id: str
+    label: str
+    fragment_id: str
+    proto: object
+
+
+class SessionClient:
+    """A simulated browser tab connected to ``url``."""
+
+    def __init__(self, url="http://localhost:8501", query_string="", timeout=60.0):
+        self.ws_url = url.replace("http://", "ws://").replace("https://", "wss://").rstrip("/") + "/_stcore/stream"
+        self.query_string = query_string
+        self.timeout = timeout
+        self._ws = None
+        self._elements = {}  # delta path -> (kind, element proto, fragment id, run number)
+        self._values = {}  # widget id -> value sent with every rerun
+        self._run = 0
+
+    async def __aenter__(self):
+        self._ws = await websockets.connect(self.ws_url, subprotocols=["streamlit"], max_size=None)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._ws.close()
+
+    @property
+    def widgets(self):
+        found = []
+        for kind, proto, fragment_id, _ in self._elements.values():
+            if kind in _WIDGET_KINDS:
+                label = proto.component_name if kind == "component_instance" else proto.label
+                found.append(Widget(kind, proto.id, label, fragment_id, proto))
+        return found
+
+    def find(self, kind, label=None, key=None):
+        """The current widget of ``kind`` with this label and/or user key; None if absent."""
+        for w in self.widgets:
+            if w.kind == kind and (label is None or w.label == label) and (key is None or w.id.endswith(f"-{key}")):
+                return w
+        return None
+
+    def has_text(self, text):
+        return any(kind == "markdown" and text in proto.body for kind, proto, _, _ in self._elements.values())
+
+    def set_value(self, widget, value):
+        """Set a checkbox/toggle (bool) or radio (option label) for the next interaction."""
+        self._values[widget.id] = value
+
+    async def submit(self, widget, value, name=None):
+        """Send a custom component's value, as its ``setComponentValue`` would."""
+        self._values[widget.id] = value
+        return await self._rerun(name or widget.label)
+
+    async def load(self):
+        return await self._rerun("load")
+
+    async def click(self, widget, name=None):
+        return await self._rerun(name or widget.label, trigger=widget)
+
+    async def _rerun(self, name, trigger=None):
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.query_string = self.query_string
+        state.page_script_hash = ""
+        for w in self.widgets:
+            if w.kind == "button" or (w.kind == "component_instance" and w.id not in self._values):
+                continue
+            ws = state.widget_states.widgets.add()
+            ws.id = w.id
+            if w.kind == "component_instance":
+                ws.json_value = json.dumps(self._values[w.id])
+            elif w.kind == "checkbox":
+                ws.bool_value = bool(self._values.get(w.id, w.proto.default))
+            else:
+                default = w.proto.options[w.proto.default] if len(w.proto.options) else ""
+                ws.string_value = self._values.get(w.id, default)
+        if trigger is not None:
+            ws = state.widget_states.widgets.add()
+            ws.id = trigger.id
+            ws.trigger_value = True
+            state.fragment_id = trigger.fragment_id
+
+        result = Interaction(name, fragment=bool(state.fragment_id))
+        started = time.perf_counter()
+        await self._ws.send(msg.SerializeToString())
+        while True:
+            raw = await asyncio.wait_for(self._ws.recv(), self.timeout)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            result.messages += 1
+            result.bytes += len(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "new_session":
+                self._run += 1
+            elif kind == "delta":
+                self._apply_delta(fwd, result)
+            elif kind == "script_finished":
+                result.script_runs += 1
+                if fwd.script_finished in _FINAL_STATUSES:
+                    break
+        result.latency = time.perf_counter() - started
+        self._drop_stale(state.fragment_id)
+        return result
+
+    def _apply_delta(self, fwd, result):
+        delta = fwd.delta
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        result.element_counts[kind] = result.element_counts.get(kind, 0) + 1
+        self._elements[tuple(fwd.metadata.delta_path)] = (kind, getattr(element, kind), delta.fragment_id, self._run)
+
+    def _drop_stale(self, fragment_id):
+        # Like the browser: elements not re-sent by this run disappear (only
+        # within the fragment for fragment-scoped runs)
+        for path, (_, _, frag, run) in list(self._elements.items()):
+            if run != self._run and (not fragment_id or frag == fragment_id):
+                del self._elements[path]
+
+
+def _free_port():
+    with contextlib.closing(socket.socket()) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def serve_app(script=APP_SCRIPT, port=None, env=None, startup_timeout=60.0):
+    """Run ``streamlit run script`` headless on a local port; yields ``(url, process)``."""
+    port = port or _free_port()
+    cmd = [sys.executable, "-m", "streamlit", "run", str(script),
+           "--server.headless", "true", "--server.port", str(port),
+           "--browser.gatherUsageStats", "false", "--server.fileWatcherType", "none"]
+    proc = subprocess.Popen(cmd, cwd=Path(script).resolve().parent, env={**os.environ, **(env or {})},
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                with urllib.request.urlopen(f"{url}/_stcore/health", timeout=1) as r:
+                    if r.status == 200:
+                        break
+            except OSError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"streamlit did not start on port {port}") from None
+                time.sleep(0.2)
+        yield url, proc
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
@@ -0,0 +1,78 @@
+"""Short shareable codes for finished classifications.
+
+A code is the answer vector packed base-5 (four options plus skip per
+question, question 0 least significant, as in ``pack_answers``) and written
+in base 62: four characters cover all 5 ** 10 vectors.  Questions a quiz
+never asked (early stop) are packed as skips, which score the same.  Opening
+``?r=<code>`` shows the "Classification Complete" screen for those answers
+directly.
+
+The result behind a code (percentages, explanation and the card and bullet
+markup) is built once and kept in a bounded LRU cache shared by all sessions,
+so a widely shared link is served from memory; the chart itself comes from
+the render cache, keyed on the same percentages.  Reasons are listed in
+question order, so for adaptive quizzes ties may come out in a different
+order than on the original screen.
+"""
+
+import os
+import string
+from collections import namedtuple
+
+from sss.charts import RenderCache
+from sss.quiz_state import QuizRecord
+from sss.scoring import N_QUESTIONS, SKIP
+from sss.theme import bullet_html, result_card_html
+
+ALPHABET = string.digits + string.ascii_uppercase + string.ascii_lowercase
+CODE_LENGTH = 4
+_DIGITS = {c: i for i, c in enumerate(ALPHABET)}
+_N_CODES = (SKIP + 1) ** N_QUESTIONS
+
+SharedResult = namedtuple("SharedResult", "code answers pcts explanation card_html bullets_html")
+
+result_cache = RenderCache(maxsize=int(os.environ.get("SSS_SHARE_CACHE", 4096)))
+
+
+def encode(answers):
+    """Code for an answer vector (option index, ``SKIP`` or None for never asked, per question)."""
+    packed = 0
+    for o_idx in reversed(answers):
+        packed = packed * (SKIP + 1) + (SKIP if o_idx is None else o_idx)
+    chars = []
+    for _ in range(CODE_LENGTH):
+        packed, digit = divmod(packed, len(ALPHABET))
+        chars.append(ALPHABET[digit])
+    return "".join(reversed(chars))
+
+
+def decode(code):
+    """Answer vector of a code; ValueError if it isn't one."""
+    code = str(code).strip()
+    if not code or len(code) > CODE_LENGTH or any(c not in _DIGITS for c in code):
+        raise ValueError(f"not a result code: {code!r}")
+    packed = 0
+    for c in code:
+        packed = packed * len(ALPHABET) + _DIGITS[c]
+    if packed >= _N_CODES:
+        raise ValueError(f"not a result code: {code!r}")
+    answers = []
+    for _ in range(N_QUESTIONS):
+        packed, o_idx = divmod(packed, SKIP + 1)
+        answers.append(o_idx)
+    return answers
+
+
+def _build(code, answers):
+    record = QuizRecord.from_answers(answers)
+    pcts = record.pcts()
+    explanation = record.explain()
+    return SharedResult(code, tuple(answers), pcts, explanation, result_card_html(explanation.winner, pcts),
+                        tuple(bullet_html(b) for b in explanation.bullets))
+
+
+def shared_result(code):
+    """Memoized result for a code (ValueError if it isn't one)."""
+    answers = decode(code)
+    code = encode(answers)  # canonical form, so "00a1" and "a1" share an entry
+    return result_cache.get_or_build(code, lambda: _build(code, answers))
@@ -0,0 +1,96 @@
+"""Page styling and markup, static parts prepared once per process.
+
+The stylesheet is minified at import time; every rerun then sends the same
+pre-built string instead of re-assembling the full block.
+"""
+
+import re
+
+from sss.scoring import LABELS
+
+# Custom CSS - dark theme and contrast-safe colors
+_CSS = """
+    body { background: linear-gradient(135deg, #0b1226 0%, #17233d 100%); color: #e6eef8; }
+    .title-container { 
+        text-align: center; 
+        padding: 1.6rem 0; 
+        border-radius: 12px; 
+        margin-bottom: 1rem; 
+        animation: fadeIn 0.6s ease-in; 
+        background: linear-gradient(135deg, #15284b 0%, #223a66 100%); 
+    }
+    .title-container h1 { 
+        color: #f8fbff; 
+        font-size: 2.2em; 
+        margin: 0; 
+        text-shadow: 1px 1px 3px rgba(0,0,0,0.6); 
+    }
+    .title-container p { color: #dceeff; margin-top: 0.25rem }
+
+    /* Dark cards for questions and results */
+    .question-container { 
+        background: linear-gradient(180deg, #0f2138 0%, #0b1a2d 100%); 
+        border-radius: 10px; 
+        padding: 1.2rem; 
+        margin: 0.8rem 0; 
+        box-shadow: 0 6px 20px rgba(5,12,30,0.6); 
+        border-left: 4px solid #274b94; 
+    }
+    .question-text { 
+        font-size: 1.05em; 
+        font-weight: 700; 
+        color: #eaf3ff; 
+        margin-bottom: 0.9rem; 
+    }
+    .results-container { 
+        background: linear-gradient(180deg, #0f2138 0%, #071425 100%); 
+        border-radius: 10px; 
+        padding: 1rem; 
+        box-shadow: 0 6px 24px rgba(3,8,20,0.65); 
+        color: #eaf3ff;
+    }
+    .explanation-box { background: transparent; padding: 0.6rem; border-left: 3px solid #274b94; color: #dceeff; margin: 0.4rem 0; }
+    .reasoning-box { background: rgba(255,255,255,0.02); padding: 0.8rem; border-radius: 6px; color: #e6f0ff; margin: 0.4rem 0; }
+
+    /* Buttons and radio styling fallback */
+    .stButton>button { background: linear-gradient(90deg,#2b4f9b,#3b6fb2); color: white; }
+
+    @keyframes fadeIn { from { opacity: 0; } to { opacity: 1; } }
+"""
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace; enough for our hand-written rules."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+APP_CSS = f"<style>{minify_css(_CSS)}</style>"
+
+TITLE_HTML = """
+    <div class="title-container">
+        <h1>🍲 FOOD CLASSIFIER 🥗 🥪</h1>
+        <p>Answer questions about a food item to classify if it's more Soup, Salad, or Sandwich</p>
+    </div>
+"""
+
+
+def result_card_html(winner, pcts):
+    """The "Classification Complete" card: winner and its percentage."""
+    percent_text = f"{pcts[LABELS.index(winner)]:.1f}%"
+    return f"""
+            <div class="question-container">
+                <h2>Classification Complete</h2>
+                <h3>Result: {winner}</h3>
+                
+<p style="font-size: 1.2em; color: #667eea; font-weight: bold;">{percent_text}</p>
+
+            </div>
+        """
+
+
+def bullet_html(bullet):
+    b_clean = bullet.replace('<', '').replace('>', '').strip()
+    return f'<div class="reasoning-box">• {b_clean}</div>'